@@ -7,6 +7,8 @@ from typing import Dict, List, Any
 
 from flask import Flask, jsonify, send_from_directory
 
+from common import poster_variant
+
 
 BASE_DIR = Path(__file__).parent.resolve()
 SEANCES_DIR = BASE_DIR / "seances"
@@ -44,8 +46,11 @@ def file_exists(path_str: str | None) -> bool:
         return False
 
 
-def poster_relative_url(file_poster: str | None) -> str | None:
-    """Return a URL path like 'posters/2025-S43/name.jpg' if file_poster is under POSTERS_DIR."""
+def poster_relative_url(file_poster: str | None, variant: str | None = "thumb") -> str | None:
+    """
+    Return a URL path like 'posters/variants/thumb/<sha256>.webp' if file_poster is under POSTERS_DIR.
+    The thumbnail variant is generated on first use; variant=None returns the original file.
+    """
     if not file_poster:
         return None
     try:
@@ -53,6 +58,9 @@ def poster_relative_url(file_poster: str | None) -> str | None:
         if not p.exists() or not p.is_file():
             return None
         # Ensure we only expose files inside the posters directory
+        p.relative_to(POSTERS_DIR)
+        if variant:
+            p = poster_variant(p, variant, POSTERS_DIR)
         rel = p.relative_to(POSTERS_DIR)
         return f"posters/{rel.as_posix()}"
     except Exception:
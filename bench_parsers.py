@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Banc d'essai hors-ligne des parseurs HTML, sur les fixtures de examples/ :
+  - CinemaParadiso.parse_program   (page programme du site, chaque backend)
+  - CinemaClient.parse_program_html (espace adhérents Cinédiffusion)
+  - get_description.parse_fiche     (fiche film)
+Chaque fixture est aussi agrandie synthétiquement (10×, 100× semaines) pour
+voir comment le coût évolue avec la taille de la page. Pour chaque cas on
+mesure le temps (min / médiane sur --repeat passes) et le pic mémoire (tracemalloc).
+
+Exemples :
+  python bench_parsers.py
+  python bench_parsers.py --save-baseline bench_baseline.json
+  python bench_parsers.py --baseline bench_baseline.json --tolerance 1.5   # code 1 si régression
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import get_description
+import get_prog_from_distrib
+import get_prog_from_site
+
+EXAMPLES_DIR = Path(__file__).resolve().parent / "examples"
+PARADISO_HTML = EXAMPLES_DIR / "Cinema Paradiso Nort sur Erdre.html"
+DISTRIB_HTML = EXAMPLES_DIR / "Espace Adhérents Cinédiffusion.html"
+FICHE_HTML = EXAMPLES_DIR / "film.htm"
+SCALES = (1, 10, 100)
+
+
+def _read(path: Path) -> str:
+    return path.read_text(encoding="utf-8", errors="replace")
+
+
+def _enlarge(html: str, start_marker: str, end_marker: str, factor: int, year_re: str) -> str:
+    """
+    Répète `factor` fois le bloc des semaines (du premier start_marker au dernier end_marker),
+    en décalant l'année à chaque copie pour obtenir des semaines distinctes.
+    """
+    if factor == 1:
+        return html
+    start = html.index(start_marker)
+    end = html.rindex(end_marker) + len(end_marker)
+    block = html[start:end]
+    copies = []
+    for i in range(factor):
+        copies.append(re.sub(year_re, lambda m: m.group(1) + str(int(m.group(2)) + i), block))
+    return html[:start] + "".join(copies) + html[end:]
+
+
+def enlarge_paradiso(html: str, factor: int) -> str:
+    return _enlarge(html, "<section", "</section>", factor, r"(\s)(20\d\d)\b")
+
+
+def enlarge_distrib(html: str, factor: int) -> str:
+    return _enlarge(html, "<h3", "</table>", factor, r"(/)(20\d\d)\b")
+
+
+def enlarge_fiche(html: str, factor: int) -> str:
+    # Une page listant plusieurs fiches : seule la première doit être extraite
+    return html * factor
+
+
+def _measure(fn: Callable[[], None], repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "peak_mib": peak / (1024 * 1024),
+    }
+
+
+def _quiet(fn: Callable[[], object]) -> Callable[[], None]:
+    """Exécute fn sans ses print() (les parseurs sont bavards)."""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+    return run
+
+
+def build_cases(workdir: Path) -> List[Tuple[str, Callable[[], None]]]:
+    """Liste des cas (nom, fonction) ; les fichiers produits vont dans workdir."""
+    cases: List[Tuple[str, Callable[[], None]]] = []
+    paradiso = _read(PARADISO_HTML)
+    distrib = _read(DISTRIB_HTML)
+    fiche = _read(FICHE_HTML)
+
+    for scale in SCALES:
+        html_path = workdir / f"paradiso_x{scale}.html"
+        html_path.write_text(enlarge_paradiso(paradiso, scale), encoding="utf-8")
+        for backend in get_prog_from_site.PARSER_BACKENDS:
+            if backend == "lxml" and get_prog_from_site.lxml_html is None:
+                continue
+            seances_dir = workdir / f"seances_{backend}_x{scale}"
+
+            def run_paradiso(backend=backend, html_path=html_path, seances_dir=seances_dir):
+                cinema = get_prog_from_site.CinemaParadiso(parser=backend, seances_dir=seances_dir)
+                cinema.parse_program(str(html_path))
+
+            cases.append((f"paradiso.parse_program[{backend}] x{scale}", _quiet(run_paradiso)))
+
+        distrib_html = enlarge_distrib(distrib, scale)
+        client = get_prog_from_distrib.CinemaClient(cookies_path=None)
+        cases.append((f"distrib.parse_program_html x{scale}",
+                      _quiet(lambda client=client, html=distrib_html: client.parse_program_html(html))))
+
+        fiche_html = enlarge_fiche(fiche, scale)
+        cases.append((f"description.parse_fiche x{scale}",
+                      _quiet(lambda html=fiche_html: get_description.parse_fiche(html))))
+
+    return cases
+
+
+def check_backend_parity() -> bool:
+    """Vérifie que tous les backends disponibles extraient la même chose de la fixture."""
+    html = _read(PARADISO_HTML)
+    results = {}
+    for name in get_prog_from_site.PARSER_BACKENDS:
+        try:
+            backend = get_prog_from_site.get_program_parser(name)
+        except ValueError:
+            continue
+        results[name] = backend.parse_weeks(html)
+    reference = next(iter(results.values()))
+    ok = all(result == reference for result in results.values())
+    print(f"Parité des backends ({', '.join(results)}) : {'OK' if ok else 'DIFFÉRENCES'}")
+    return ok
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Banc d'essai hors-ligne des parseurs HTML")
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre de passes chronométrées par cas")
+    parser.add_argument("--filter", default="", help="Ne lance que les cas dont le nom contient ce texte")
+    parser.add_argument("--save-baseline", help="Enregistre les résultats dans ce fichier JSON")
+    parser.add_argument("--baseline", help="Compare aux résultats de ce fichier JSON")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="Facteur de ralentissement toléré par rapport à la référence (défaut: 1.5)")
+    args = parser.parse_args(argv)
+
+    parity_ok = check_backend_parity()
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="bench_parsers_") as tmp:
+        workdir = Path(tmp)
+        # parse_program_html écrit dans films/ relatif au répertoire courant
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for name, fn in build_cases(workdir):
+                if args.filter and args.filter not in name:
+                    continue
+                results[name] = _measure(fn, max(1, args.repeat))
+                r = results[name]
+                print(f"{name:<45} min {r['min_s'] * 1000:9.2f} ms   "
+                      f"médiane {r['median_s'] * 1000:9.2f} ms   pic {r['peak_mib']:7.2f} Mio", flush=True)
+        finally:
+            os.chdir(previous_cwd)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Référence enregistrée: {args.save_baseline}")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for name, r in results.items():
+            ref = baseline.get(name)
+            if ref and r["min_s"] > ref["min_s"] * args.tolerance:
+                regressions.append(name)
+                print(f"[RÉGRESSION] {name}: {r['min_s'] * 1000:.2f} ms (référence {ref['min_s'] * 1000:.2f} ms)")
+        if not regressions:
+            print(f"Aucune régression au-delà de ×{args.tolerance}.")
+
+    return 0 if parity_ok and not regressions else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -1,6 +1,37 @@
 from __future__ import annotations
+import hashlib
+import json
+import os
 import re
+import time
+import io
+import shutil
+import subprocess
+import threading
 import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+
+try:
+    from PIL import Image
+except ImportError:  # Sans Pillow, les variantes de posters renvoient l'original
+    Image = None
+
+HTTP_CACHE_DIR = Path(__file__).resolve().parent / "cache" / "http"
+MEDIA_PROBE_INDEX = Path(__file__).resolve().parent / "cache" / "media_probe.json"
+POSTERS_DIR = Path(__file__).resolve().parent / "posters"
+POSTER_VARIANTS_DIRNAME = "variants"
+
+# Variantes dérivées des posters : (boîte max largeur x hauteur, format, qualité)
+POSTER_VARIANTS: Dict[str, Tuple[Tuple[int, int], str, int]] = {
+    "thumb": ((360, 540), "WEBP", 80),      # vignette du tableau de bord
+    "carton": ((1880, 1040), "JPEG", 92),   # poster d'un carton 1920x1080 (moins les marges)
+    "meta": ((2048, 2048), "JPEG", 85),     # image envoyée à Facebook/Instagram
+}
+_VARIANT_EXTENSIONS = {"WEBP": ".webp", "JPEG": ".jpg", "PNG": ".png"}
 
 def sanitize_filename(name: str, max_length: int = 150) -> str:
     """
@@ -51,3 +82,289 @@ def sanitize_filename(name: str, max_length: int = 150) -> str:
         cleaned = cleaned[:max_length].rstrip("._- ")
 
     return cleaned
+
+
+def write_bytes_atomic(path: Path, data: bytes, mode: Optional[int] = None) -> None:
+    """
+    Écrit `data` dans un fichier temporaire voisin puis le renomme sur `path`.
+    Avec `mode` (ex. 0o600), le fichier temporaire est créé directement avec ces
+    droits : le contenu n'est jamais lisible plus largement, même un instant.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    if mode is None:
+        with open(tmp, "wb") as f:
+            f.write(data)
+    else:
+        # Un reste d'exécution interrompue garderait ses anciens droits : on repart d'un fichier neuf
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+    os.replace(tmp, path)
+
+
+def json_bytes(data) -> bytes:
+    """Sérialisation JSON canonique des fichiers de séances (UTF-8, indentée)."""
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def save_json_if_changed(path: Path, data) -> bool:
+    """
+    Écrit `data` en JSON dans `path` uniquement si l'empreinte du contenu diffère
+    de celle du fichier existant (mtime inchangé sinon). Renvoie True si écrit.
+    """
+    payload = json_bytes(data)
+    try:
+        if content_hash(path.read_bytes()) == content_hash(payload):
+            return False
+    except FileNotFoundError:
+        pass
+    write_bytes_atomic(path, payload)
+    return True
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    text: str
+    content_hash: str
+    from_cache: bool  # True si le corps vient du cache (304 ou TTL non expiré)
+    changed: bool     # False si le contenu est identique à la version déjà en cache
+
+
+class HttpCache:
+    """
+    Cache HTTP sur disque partagé par les scrapers (GET conditionnel).
+
+    Pour chaque URL on conserve le corps et ses métadonnées (ETag, Last-Modified,
+    empreinte SHA-256, date de récupération) dans cache/http/. Une nouvelle
+    requête envoie If-None-Match / If-Modified-Since : un 304 renvoie le corps
+    en cache sans le retélécharger. Si le serveur ne gère pas les requêtes
+    conditionnelles, l'empreinte permet quand même de savoir si le contenu a changé.
+    Avec ttl > 0, une entrée plus récente que ttl secondes est servie sans requête.
+    """
+
+    def __init__(self, cache_dir: Path = HTTP_CACHE_DIR, ttl: float = 0,
+                 session: Optional[requests.Session] = None, timeout: float = 20):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def _load_meta(self, url: str) -> Optional[dict]:
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            with meta_path.open("r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("url") == url else None
+
+    def _save(self, url: str, meta: dict, text: Optional[str]) -> None:
+        meta_path, body_path = self._paths(url)
+        if text is not None:
+            write_bytes_atomic(body_path, text.encode("utf-8"))
+        write_bytes_atomic(meta_path, json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def _cached(self, url: str, meta: dict) -> CachedResponse:
+        _, body_path = self._paths(url)
+        return CachedResponse(
+            url=url,
+            text=body_path.read_text(encoding="utf-8"),
+            content_hash=meta["content_hash"],
+            from_cache=True,
+            changed=False,
+        )
+
+    def get(self, url: str, force: bool = False) -> CachedResponse:
+        """
+        Récupère `url` en passant par le cache.
+        force=True ignore le TTL et les validateurs (téléchargement complet) ;
+        `changed` reste calculé par rapport à la version en cache.
+        Lève requests.RequestException en cas d'erreur réseau/HTTP.
+        """
+        meta = self._load_meta(url)
+        now = time.time()
+
+        if meta and not force and self.ttl > 0 and now - meta.get("fetched_at", 0) < self.ttl:
+            return self._cached(url, meta)
+
+        headers = {}
+        if meta and not force:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        resp = self.session.get(url, headers=headers, timeout=self.timeout)
+        if resp.status_code == 304 and meta:
+            meta["fetched_at"] = now
+            self._save(url, meta, None)
+            return self._cached(url, meta)
+        resp.raise_for_status()
+
+        text = resp.text
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        previous_hash = meta.get("content_hash") if meta else None
+        changed = content_hash != previous_hash
+        new_meta = {
+            "url": url,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "content_hash": content_hash,
+            "fetched_at": now,
+        }
+        self._save(url, new_meta, text if changed or not meta else None)
+        return CachedResponse(url=url, text=text, content_hash=content_hash, from_cache=False, changed=changed)
+
+
+_digest_lock = threading.Lock()
+_digest_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 d'un fichier, mémorisé par (chemin, taille, mtime) pour la durée du processus."""
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _digest_lock:
+        digest = _digest_memo.get(key)
+    if digest is None:
+        digest = content_hash(path.read_bytes())
+        with _digest_lock:
+            _digest_memo[key] = digest
+    return digest
+
+
+def poster_variant(source: Path, variant: str, posters_dir: Path = POSTERS_DIR) -> Path:
+    """
+    Chemin de la variante `variant` (voir POSTER_VARIANTS) du poster `source`,
+    générée au premier appel dans posters/variants/<variant>/<sha256 de la source><ext>.
+    La clé étant le contenu de la source, un poster partagé par plusieurs semaines
+    n'est dérivé qu'une fois, et un poster remplacé obtient une nouvelle variante.
+    Renvoie `source` si Pillow est absent ou si l'image ne peut pas être lue.
+    """
+    box, fmt, quality = POSTER_VARIANTS[variant]
+    source = Path(source)
+    if Image is None:
+        return source
+    target = posters_dir / POSTER_VARIANTS_DIRNAME / variant / f"{file_digest(source)}{_VARIANT_EXTENSIONS[fmt]}"
+    if target.exists():
+        return target
+    try:
+        with Image.open(source) as img:
+            img = img.convert("RGB")
+            img.thumbnail(box, Image.LANCZOS)
+            buffer = io.BytesIO()
+            img.save(buffer, fmt, quality=quality, optimize=True)
+    except Exception as e:
+        print(f"[AVERTISSEMENT] Variante '{variant}' impossible pour {source.name}: {e}")
+        return source
+    write_bytes_atomic(target, buffer.getvalue())
+    return target
+
+
+@dataclass
+class MediaInfo:
+    width: int
+    height: int
+    fps: Optional[float]
+    duration: Optional[float]
+    vcodec: Optional[str]
+    acodec: Optional[str]
+    has_audio: bool
+
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    """ "30000/1001" -> 29.97 ; None si absent ou nul."""
+    if not rate:
+        return None
+    num, _, den = rate.partition("/")
+    try:
+        value = float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return round(value, 3) or None
+
+
+class MediaProbe:
+    """
+    Caractéristiques des fichiers vidéo (dimensions, fps, durée, codecs, piste audio)
+    lues par ffprobe et conservées dans cache/media_probe.json. Une entrée reste
+    valable tant que la taille et la date de modification du fichier n'ont pas changé :
+    chaque bande-annonce n'est sondée qu'une fois, quel que soit le nombre d'exécutions.
+    """
+
+    def __init__(self, index_path: Path = MEDIA_PROBE_INDEX):
+        self.index_path = Path(index_path)
+        self._lock = threading.Lock()
+        self.entries: Dict[str, dict] = {}
+        if self.index_path.exists():
+            try:
+                with self.index_path.open("r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def save(self) -> None:
+        with self._lock:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            save_json_if_changed(self.index_path, self.entries)
+
+    @staticmethod
+    def _ffprobe(path: Path) -> Optional[dict]:
+        if shutil.which("ffprobe") is None:
+            print("[ERREUR] ffprobe introuvable dans le PATH (installé avec ffmpeg).")
+            return None
+        cmd = ["ffprobe", "-v", "error", "-print_format", "json", "-show_streams", "-show_format", str(path)]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"[ERREUR] ffprobe a échoué pour {path.name}: {result.stderr.strip()}")
+            return None
+        data = json.loads(result.stdout or "{}")
+        video = next((st for st in data.get("streams", []) if st.get("codec_type") == "video"), None)
+        audio = next((st for st in data.get("streams", []) if st.get("codec_type") == "audio"), None)
+        if video is None:
+            return None
+        duration = data.get("format", {}).get("duration") or video.get("duration")
+        return {
+            "width": int(video.get("width") or 0),
+            "height": int(video.get("height") or 0),
+            "fps": _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate")),
+            "duration": float(duration) if duration else None,
+            "vcodec": video.get("codec_name"),
+            "acodec": audio.get("codec_name") if audio else None,
+            "has_audio": audio is not None,
+        }
+
+    def probe(self, path) -> Optional[MediaInfo]:
+        """Informations du fichier `path` (depuis l'index si inchangé), None si illisible."""
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        key = str(path.resolve())
+        with self._lock:
+            entry = self.entries.get(key)
+        if not entry or entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns:
+            info = self._ffprobe(path)
+            if info is None:
+                return None
+            entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, **info}
+            with self._lock:
+                self.entries[key] = entry
+        return MediaInfo(**{k: entry[k] for k in MediaInfo.__dataclass_fields__})
@@ -1,12 +1,24 @@
 import argparse
+import json
 import os
+import hashlib
+import re
+import shutil
+import tempfile
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from pathlib import Path
 import glob
 
 import yt_dlp
 from dotenv import load_dotenv
 from googleapiclient.discovery import build
 
+from common import save_json_if_changed
+
 
 # Exemple d'utilisation :
 # python get_bandes_annonces.py --channels config/channels.txt --output bandes_annonces/2025-S28
@@ -19,7 +31,36 @@ from googleapiclient.discovery import build
 # --------- CONFIGURATION ---------
 CHANNELS = "config/channels.txt"
 DOWNLOAD_PATH = "bandes_annonces"
+LIBRARY_DIRNAME = "library"    # bandes_annonces/library/ : une copie de chaque bande-annonce
+# Extensions d'une bande-annonce terminée ; les flux séparés de yt-dlp (<id>.f137.mp4)
+# et les fichiers partiels n'en sont pas
+TRAILER_EXTENSIONS = (".mp4", ".mkv", ".webm")
 MAX_RESULTS = 5
+DOWNLOAD_WORKERS = 3           # téléchargements yt-dlp simultanés
+# Profils de sortie : hauteur max et codecs visés, pour recevoir directement ce que
+# make_videos_youtube encode (H.264 + AAC) au lieu de flux 4K VP9/AV1 à réencoder.
+OUTPUT_PROFILES = {
+    "1080p": {"height": 1080, "vcodec": "avc1", "acodec": "mp4a"},
+    "720p": {"height": 720, "vcodec": "avc1", "acodec": "mp4a"},
+    "best": None,  # comportement historique : meilleure qualité disponible
+}
+DEFAULT_PROFILE = "1080p"
+SEARCH_CACHE_PATH = "cache/youtube_search.json"
+SEARCH_TTL_DAYS = 30           # durée de validité d'une bande-annonce trouvée
+SEARCH_NEGATIVE_TTL_DAYS = 2   # un film sans résultat est recherché à nouveau après ce délai
+CHANNEL_INDEX_PATH = "cache/youtube_channels.json"
+CHANNEL_REFRESH_HOURS = 12     # intervalle minimal entre deux lectures de la playlist d'une chaîne
+CHANNEL_MAX_PAGES = 4          # pages de 50 vidéos lues au plus par chaîne et par rafraîchissement
+CHANNEL_RESOLVE_PER_RUN = 5    # recherches de chaîne (100 unités chacune) autorisées par exécution
+TRAILER_CUES = (" bande annonce ", " trailer ", " ba ", " teaser ")
+# Mots d'habillage des titres de bandes-annonces, ignorés pour juger de la ressemblance
+TRAILER_NOISE = {"bande", "annonce", "trailer", "ba", "teaser", "vf", "vost", "vostfr", "officielle",
+                 "official", "officiel", "hd", "4k", "nouvelle", "finale", "final", "au", "cinema", "film",
+                 "le", "la", "les", "l", "de", "du", "des", "d", "un", "une", "a", "et"}
+TRAILER_DURATION_RANGE = (60, 210)  # secondes : en deçà un teaser, au-delà une featurette
+RANK_MAX_CANDIDATES = 10       # vidéos de l'index départagées par videos.list
+INDEX_MIN_COVERAGE = 0.6       # part minimale du titre de la vidéo (hors habillage) couverte par le film
+CHANNEL_UNRESOLVED_RETRY_DAYS = 30
 # ---------------------------------
 
 # Charger les variables d'environnement
@@ -32,8 +73,417 @@ if not YOUTUBE_API_KEY:
     raise RuntimeError("Clé API YouTube manquante. Vérifiez votre fichier .env.")
 
 
-def search_trailer(title, allowed_channels=None):
-    youtube = build("youtube", "v3", developerKey=YOUTUBE_API_KEY)
+# Mots trop génériques pour rapprocher un distributeur d'une chaîne YouTube
+DISTRIBUTOR_STOPWORDS = {
+    "the", "company", "distribution", "distributeur", "distributors", "distribut", "distrib",
+    "films", "film", "pictures", "studios", "studio", "france", "fr", "international", "internatio",
+    "departement", "deprt", "dept", "sa", "sas",
+    "le", "la", "les", "de", "du", "des", "d", "l", "et",
+}
+
+
+def _is_distributor_stopword(token):
+    # Les noms du programme sont souvent tronqués ("Distribut?", "Internat") :
+    # un début de mot vide est lui aussi un mot vide
+    return any(stopword.startswith(token) for stopword in DISTRIBUTOR_STOPWORDS)
+
+
+def _distributor_tokens(name):
+    text = "".join(c for c in unicodedata.normalize("NFD", name.lower()) if unicodedata.category(c) != "Mn")
+    return [t for t in re.split(r"[^a-z0-9]+", text) if t and not _is_distributor_stopword(t)]
+
+
+def distributor_channels(distributeur, allowed_channels):
+    """
+    Chaînes autorisées correspondant au distributeur d'un film
+    (ex. "THE WALT DISNEY COMPANY" -> ["Disney FR"], "PATHE FILMS" -> ["Pathe", "Pathé Films"]).
+    """
+    if not distributeur or not allowed_channels:
+        return []
+    tokens = set(_distributor_tokens(distributeur))
+    if not tokens:
+        return []
+    matches = []
+    for channel in allowed_channels:
+        channel_tokens = _distributor_tokens(channel)
+        compact = "".join(channel_tokens)
+        # Égalité de mots, ou nom accolé ("PyramideDistrib" pour "PYRAMIDE DISTRIBUTION")
+        if tokens & set(channel_tokens) or any(len(t) >= 4 and t in compact for t in tokens):
+            matches.append(channel)
+    return matches
+
+
+def normalize_title(title):
+    """Titre comparable : sans accents ni ponctuation, en minuscules ("L'Été !" -> "l ete")."""
+    text = "".join(c for c in unicodedata.normalize("NFD", title.lower()) if unicodedata.category(c) != "Mn")
+    return " ".join(re.split(r"[^a-z0-9]+", text)).strip()
+
+
+_TRAILING_ARTICLE_RE = re.compile(r"\s*\((les|le|la|l')\)\s*$", flags=re.IGNORECASE)
+
+
+def film_title_words(title):
+    """
+    Mots d'un titre tel que l'écrit le programme du distributeur : l'article rejeté en
+    fin de titre repasse devant ("SCHTROUMPFS LE FILM (LES)" -> les schtroumpfs le film),
+    les autres parenthèses, souvent le réalisateur ("ELIO (SHARAFIAN)"), sont mises à part.
+    Renvoie (mots du titre, mots entre parenthèses).
+    """
+    match = _TRAILING_ARTICLE_RE.search(title)
+    if match:
+        title = f"{match.group(1)} {title[:match.start()]}"
+    # Une parenthèse non refermée vient d'un titre tronqué
+    title = re.sub(r"\([^)]*$", " ", title)
+    hints = normalize_title(" ".join(re.findall(r"\((.*?)\)", title))).split()
+    words = normalize_title(re.sub(r"\(.*?\)", " ", title)).split()
+    return words, hints
+
+
+def _words_at(words, film_words, start, prefix_last):
+    for offset, film_word in enumerate(film_words):
+        word = words[start + offset]
+        if word == film_word:
+            continue
+        # Dernier mot coupé par le programme ("DOUDOU PER" pour "doudou perdu")
+        if prefix_last and offset == len(film_words) - 1 and word.startswith(film_word):
+            continue
+        return False
+    return True
+
+
+def contains_film_title(words, film_words):
+    """
+    Vrai si `film_words` figure à la suite dans `words`. L'article initial est facultatif,
+    et pour un titre long (donc peut-être tronqué), le dernier mot peut n'être qu'un début de mot.
+    """
+    variants = [film_words]
+    if len(film_words) > 1 and film_words[0] in ("le", "la", "les", "l"):
+        variants.append(film_words[1:])
+    for variant in variants:
+        prefix_last = len(film_words) >= 3 and not variant[-1].isdigit()
+        for start in range(len(words) - len(variant) + 1):
+            if _words_at(words, variant, start, prefix_last):
+                return True
+    return False
+
+
+_youtube = None
+
+
+def youtube_client():
+    """Client YouTube Data API unique : le document de découverte n'est chargé qu'une fois."""
+    global _youtube
+    if _youtube is None:
+        _youtube = build("youtube", "v3", developerKey=YOUTUBE_API_KEY, cache_discovery=False)
+    return _youtube
+
+
+class SearchCache:
+    """
+    Résultats de recherche persistés (cache/youtube_search.json) :
+    titre normalisé -> {"url", "channel", "fetched_at"}.
+    Une bande-annonce trouvée est réutilisée pendant `ttl` secondes, quelle que soit
+    la semaine ; une recherche infructueuse (url None) pendant `negative_ttl` secondes.
+    """
+
+    def __init__(self, path=SEARCH_CACHE_PATH, ttl=SEARCH_TTL_DAYS * 86400,
+                 negative_ttl=SEARCH_NEGATIVE_TTL_DAYS * 86400):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.entries = {}
+        if self.path.exists():
+            try:
+                with self.path.open("r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[!] Cache de recherche illisible, ignoré : {e}")
+
+    def get(self, title):
+        """(True, url ou None) si une réponse encore valide est en cache, sinon (False, None)."""
+        entry = self.entries.get(normalize_title(title))
+        if not entry:
+            return False, None
+        ttl = self.ttl if entry.get("url") else self.negative_ttl
+        if time.time() - entry.get("fetched_at", 0) > ttl:
+            return False, None
+        return True, entry.get("url")
+
+    def put(self, title, url, channel=None):
+        self.entries[normalize_title(title)] = {
+            "titre": title,
+            "url": url,
+            "channel": channel,
+            "fetched_at": time.time(),
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        save_json_if_changed(self.path, self.entries)
+
+
+class ChannelIndex:
+    """
+    Index local des vidéos publiées par les chaînes autorisées (cache/youtube_channels.json),
+    construit depuis leur playlist « uploads » : playlistItems.list coûte 1 unité pour
+    50 vidéos, contre 100 unités par search.list.
+
+    - Chaque chaîne de config/channels.txt est associée à son identifiant : relevé
+      gratuitement dans les résultats de search.list, sinon résolu par une recherche
+      de chaîne (au plus CHANNEL_RESOLVE_PER_RUN par exécution, une fois pour toutes).
+    - Le rafraîchissement est incrémental : on lit la playlist depuis la vidéo la plus
+      récente jusqu'à la dernière déjà vue.
+    - find() rapproche un titre de film des titres de vidéos, sans appel réseau.
+    """
+
+    def __init__(self, allowed_channels, path=CHANNEL_INDEX_PATH):
+        self.path = Path(path)
+        self.allowed = list(allowed_channels or [])
+        self.channels = {}  # titre de chaîne -> {"channel_id", "uploads", "last_seen", "refreshed_at"}
+        self.videos = {}    # id vidéo -> {"title", "channel", "published_at"}
+        self._normalized = {}  # id vidéo -> mots du titre (calculés une fois par exécution, voir _video_words)
+        if self.path.exists():
+            try:
+                with self.path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.channels = data.get("channels", {})
+                self.videos = data.get("videos", {})
+            except (OSError, ValueError) as e:
+                print(f"[!] Index des chaînes illisible, reconstruit : {e}")
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        save_json_if_changed(self.path, {"channels": self.channels, "videos": self.videos})
+
+    def learn_channel(self, channel_title, channel_id):
+        """Mémorise l'identifiant d'une chaîne autorisée vue dans un résultat de recherche."""
+        if channel_title in self.allowed and channel_id:
+            entry = self.channels.setdefault(channel_title, {})
+            if entry.get("channel_id") != channel_id:
+                entry.update({"channel_id": channel_id, "uploads": None, "last_seen": None})
+
+    def _resolve_channels(self, youtube):
+        retry_before = time.time() - CHANNEL_UNRESOLVED_RETRY_DAYS * 86400
+        missing = [c for c in self.allowed
+                   if not self.channels.get(c, {}).get("channel_id")
+                   and self.channels.get(c, {}).get("unresolved_at", 0) < retry_before]
+        for channel_title in missing[:CHANNEL_RESOLVE_PER_RUN]:
+            response = youtube.search().list(part="snippet", q=channel_title, type="channel", maxResults=5).execute()
+            for item in response.get("items", []):
+                if item["snippet"]["channelTitle"] == channel_title:
+                    self.learn_channel(channel_title, item["snippet"]["channelId"])
+                    break
+            else:
+                # Introuvable : on ne retente pas à chaque exécution
+                self.channels[channel_title] = {"channel_id": None, "unresolved_at": time.time()}
+
+        # Playlists « uploads » des chaînes résolues, par lots de 50 (1 unité par lot)
+        need_uploads = [(t, e["channel_id"]) for t, e in self.channels.items()
+                        if e.get("channel_id") and not e.get("uploads")]
+        for start in range(0, len(need_uploads), 50):
+            batch = dict((cid, t) for t, cid in need_uploads[start:start + 50])
+            response = youtube.channels().list(part="contentDetails", id=",".join(batch), maxResults=50).execute()
+            for item in response.get("items", []):
+                uploads = item["contentDetails"]["relatedPlaylists"]["uploads"]
+                self.channels[batch[item["id"]]]["uploads"] = uploads
+
+    def refresh(self, max_age=CHANNEL_REFRESH_HOURS * 3600):
+        """Complète l'index avec les nouvelles vidéos des chaînes non rafraîchies depuis max_age secondes."""
+        youtube = youtube_client()
+        self._resolve_channels(youtube)
+        # Chaînes résolues conservées même si le rafraîchissement échoue ensuite (quota)
+        self.save()
+        now = time.time()
+        for channel_title, entry in self.channels.items():
+            if not entry.get("uploads") or now - entry.get("refreshed_at", 0) < max_age:
+                continue
+            last_seen = entry.get("last_seen")
+            newest = None
+            page_token = None
+            added = 0
+            for _ in range(CHANNEL_MAX_PAGES):
+                response = youtube.playlistItems().list(
+                    part="snippet", playlistId=entry["uploads"], maxResults=50, pageToken=page_token
+                ).execute()
+                reached_last_seen = False
+                for item in response.get("items", []):
+                    video_id = item["snippet"]["resourceId"]["videoId"]
+                    if newest is None:
+                        newest = video_id
+                    if video_id == last_seen:
+                        reached_last_seen = True
+                        break
+                    self.videos[video_id] = {
+                        "title": item["snippet"]["title"],
+                        "channel": channel_title,
+                        "published_at": item["snippet"].get("publishedAt"),
+                    }
+                    added += 1
+                page_token = response.get("nextPageToken")
+                if reached_last_seen or not page_token:
+                    break
+            entry["last_seen"] = newest or last_seen
+            entry["refreshed_at"] = now
+            if added:
+                print(f"[+] {channel_title} : {added} nouvelle(s) vidéo(s) indexée(s)")
+        self.save()
+
+    def find(self, title, preferred_channels=None):
+        """Meilleure candidate de candidates(), ou None."""
+        found = self.candidates(title, preferred_channels)
+        return found[0] if found else None
+
+    def _video_words(self, video_id, video):
+        """
+        (mots du titre de la vidéo, mots restants une fois retirés l'habillage, les années
+        et le nom de la chaîne : "ELIO - Bande-annonce (VF) | Disney" -> ["elio"]).
+        """
+        cached = self._normalized.get(video_id)
+        if cached is None:
+            norm = normalize_title(video["title"])
+            channel_words = set(normalize_title(video.get("channel", "")).split())
+            remainder = [t for t in norm.split()
+                         if t not in TRAILER_NOISE and t not in channel_words
+                         and not (t.isdigit() and len(t) == 4)]
+            cached = self._normalized[video_id] = (f" {norm} ", norm.split(), remainder)
+        return cached
+
+    def candidates(self, title, preferred_channels=None):
+        """
+        Vidéos de bande-annonce de `title` parmi les vidéos indexées. Le titre du film est
+        lu au format du programme (film_title_words : article en fin, réalisateur entre
+        parenthèses, titre tronqué). Le titre de la vidéo doit en contenir les mots à la
+        suite, une mention « bande annonce » / « trailer », et peu d'autres mots (un titre
+        court ne doit pas correspondre à une phrase qui le contient par hasard) ; le nom
+        du réalisateur dans le titre de la vidéo suffit à lever ce dernier doute.
+        Les chaînes du distributeur puis les vidéos récentes passent en premier.
+        Renvoie [(video_id, chaîne)], éventuellement vide.
+        """
+        film_words, hints = film_title_words(title)
+        title_len = len([t for t in film_words if t not in TRAILER_NOISE])
+        if not title_len:
+            # Titre fait de mots d'habillage ("Le") : laissé à la recherche globale
+            return []
+        hints = {t for t in hints if len(t) >= 3}
+        candidates = []
+        for video_id, video in self.videos.items():
+            video_norm, video_words, remainder = self._video_words(video_id, video)
+            if not any(cue in video_norm for cue in TRAILER_CUES):
+                continue
+            if not contains_film_title(video_words, film_words):
+                continue
+            if not hints & set(video_words):
+                if title_len / max(len(remainder), title_len) < INDEX_MIN_COVERAGE:
+                    continue
+            preferred = bool(preferred_channels) and video["channel"] in preferred_channels
+            candidates.append((preferred, video.get("published_at") or "", video_id, video["channel"]))
+        candidates.sort(reverse=True)
+        return [(video_id, channel) for _, _, video_id, channel in candidates]
+
+
+def parse_iso_duration(value):
+    """Durée ISO 8601 de l'API YouTube en secondes ("PT2M31S" -> 151), None si illisible."""
+    match = re.fullmatch(r"P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?", value or "")
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def fetch_video_details(video_ids):
+    """snippet + contentDetails de `video_ids` via videos.list, par lots de 50 (1 unité par lot)."""
+    details = {}
+    youtube = youtube_client()
+    for start in range(0, len(video_ids), 50):
+        batch = video_ids[start:start + 50]
+        response = youtube.videos().list(part="snippet,contentDetails", id=",".join(batch), maxResults=50).execute()
+        for item in response.get("items", []):
+            details[item["id"]] = item
+    return details
+
+
+def score_candidate(item, channel, preferred_channels=None):
+    """
+    Note d'une vidéo candidate : durée typique d'une bande-annonce (ni teaser, ni
+    featurette), HD, indices de version française, chaîne du distributeur.
+    """
+    score = 0.0
+    duration = parse_iso_duration(item.get("contentDetails", {}).get("duration"))
+    if duration is not None:
+        low, high = TRAILER_DURATION_RANGE
+        if low <= duration <= high:
+            score += 3
+        elif duration > high * 1.5 or duration < low / 2:
+            score -= 3
+    if item.get("contentDetails", {}).get("definition") == "hd":
+        score += 1
+
+    snippet = item.get("snippet", {})
+    audio_language = (snippet.get("defaultAudioLanguage") or snippet.get("defaultLanguage") or "").lower()
+    if audio_language.startswith("fr"):
+        score += 2
+    title_norm = f" {normalize_title(snippet.get('title', ''))} "
+    if any(cue in title_norm for cue in (" vf ", " bande annonce ", " francais ")):
+        score += 1
+    if " vost " in title_norm or " vostfr " in title_norm:
+        score += 0.5
+
+    if preferred_channels and channel in preferred_channels:
+        score += 4
+    return score
+
+
+def rank_candidates(candidates, preferred_channels=None):
+    """
+    Meilleure vidéo parmi `candidates` [(video_id, chaîne)] d'après score_candidate, avec
+    un seul appel videos.list pour toutes. À note égale, l'ordre initial est conservé ;
+    si l'appel échoue, le premier candidat est retenu.
+    """
+    if len(candidates) == 1:
+        return candidates[0]
+    try:
+        details = fetch_video_details([video_id for video_id, _ in candidates])
+    except Exception as e:
+        print(f"[!] Détails des vidéos indisponibles, premier résultat retenu : {e}")
+        return candidates[0]
+    best, best_score = None, None
+    for video_id, channel in candidates:
+        item = details.get(video_id)
+        if item is None:
+            continue
+        score = score_candidate(item, channel, preferred_channels)
+        print(f"    {score:+.1f}  {item['snippet'].get('title', video_id)} ({channel})")
+        if best_score is None or score > best_score:
+            best, best_score = (video_id, channel), score
+    return best or candidates[0]
+
+
+def search_trailer(title, allowed_channels=None, preferred_channels=None, cache=None, index=None):
+    """
+    Cherche la bande-annonce de `title`. Les vidéos des chaînes autorisées trouvées
+    sont départagées par rank_candidates (durée, HD, version française, chaîne du
+    distributeur en priorité) avec un seul appel videos.list.
+    Avec un SearchCache, une réponse récente (positive ou négative) évite l'appel à l'API.
+    Avec un ChannelIndex, les vidéos des chaînes autorisées sont consultées d'abord ;
+    la recherche globale (100 unités de quota) ne sert qu'en dernier recours.
+    """
+    if cache is not None:
+        hit, url = cache.get(title)
+        if hit:
+            print(f"[=] Recherche en cache : {title} -> {url or 'aucune bande-annonce'}")
+            return url
+
+    if index is not None:
+        found = index.candidates(title, preferred_channels)[:RANK_MAX_CANDIDATES]
+        if found:
+            video_id, channel = rank_candidates(found, preferred_channels)
+            print(f"[✓] Bande-annonce trouvée dans l'index des chaînes : {title} ({channel})")
+            url = f"https://www.youtube.com/watch?v={video_id}"
+            if cache is not None:
+                cache.put(title, url, channel)
+            return url
+
+    youtube = youtube_client()
 
     query = f"{title} bande annonce"
     request = youtube.search().list(
@@ -48,21 +498,94 @@ def search_trailer(title, allowed_channels=None):
     for item in response["items"]:
         channel = item["snippet"]["channelTitle"]
         print(f"[?] Bande-annonce éventuelle : {title} ({channel})")
-        video_id = item["id"]["videoId"]
-        if not allowed_channels or channel in allowed_channels:
-            print(f"[✓] Bande-annonce trouvée : {title} ({channel})")
-            return f"https://www.youtube.com/watch?v={video_id}"
+        if index is not None:
+            index.learn_channel(channel, item["snippet"].get("channelId"))
+
+    candidates = [
+        (item["id"]["videoId"], item["snippet"]["channelTitle"])
+        for item in response["items"]
+        if not allowed_channels or item["snippet"]["channelTitle"] in allowed_channels
+    ]
+    if candidates:
+        video_id, channel = rank_candidates(candidates, preferred_channels)
+        print(f"[✓] Bande-annonce trouvée : {title} ({channel})")
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        if cache is not None:
+            cache.put(title, url, channel)
+        return url
 
     print(f"[✗] Aucune bande-annonce trouvée pour : {title}")
+    if cache is not None:
+        cache.put(title, None)
     return None
 
 
-def download_video(url, title, output_path, cookies_file=None, browser_cookies=None):
+class DownloadProgress:
+    """
+    Suivi des téléchargements parallèles : une ligne par palier de 25 % et par
+    bande-annonce (les barres de yt-dlp seraient illisibles entremêlées), et le
+    volume total pour le débit global.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._steps = {}
+        self._bytes = {}
+        self.start = time.perf_counter()
+
+    def hook(self, title):
+        def on_progress(d):
+            if d.get("status") not in ("downloading", "finished"):
+                return
+            key = (title, d.get("filename"))
+            downloaded = d.get("downloaded_bytes") or 0
+            total = d.get("total_bytes") or d.get("total_bytes_estimate")
+            with self._lock:
+                self._bytes[key] = downloaded
+                if d["status"] == "finished" or not total:
+                    return
+                step = int(downloaded * 4 / total)
+                if step > self._steps.get(key, 0):
+                    self._steps[key] = step
+                    speed = d.get("speed") or 0
+                    print(f"[↓] {title} : {step * 25} % ({speed / 1e6:.1f} Mo/s)", flush=True)
+        return on_progress
+
+    def summary(self, count):
+        elapsed = time.perf_counter() - self.start
+        total = sum(self._bytes.values())
+        rate = total / elapsed / 1e6 if elapsed else 0
+        print(f"[i] {count} bande(s)-annonce(s), {total / 1e6:.1f} Mo en {elapsed:.1f} s ({rate:.1f} Mo/s)")
+
+
+def format_selector(profile=DEFAULT_PROFILE):
+    """
+    Sélecteur de format yt-dlp pour un profil de OUTPUT_PROFILES : d'abord les flux
+    séparés dans les codecs visés, puis un flux combiné équivalent, puis n'importe quel
+    codec à la bonne hauteur, et en dernier recours le meilleur format disponible.
+    """
+    target = OUTPUT_PROFILES[profile]
+    if target is None:
+        return "bestvideo+bestaudio/best"
+    h, vcodec, acodec = target["height"], target["vcodec"], target["acodec"]
+    return "/".join([
+        f"bestvideo[height<={h}][vcodec^={vcodec}]+bestaudio[acodec^={acodec}]",
+        f"best[height<={h}][vcodec^={vcodec}][acodec^={acodec}]",
+        f"bestvideo[height<={h}]+bestaudio",
+        f"best[height<={h}]",
+        "best",
+    ])
+
+
+def download_video(url, title, output_path, cookies_file=None, browser_cookies=None, progress=None,
+                   profile=DEFAULT_PROFILE, filename=None):
+    """Télécharge `url` en <output_path>/<filename ou title>.<ext> ; `title` sert aux messages."""
     os.makedirs(output_path, exist_ok=True)
     ydl_opts = {
-        "format": "bestvideo+bestaudio/best",
-        "outtmpl": os.path.join(output_path, f"{title}.%(ext)s"),
-        "quiet": False,
+        "format": format_selector(profile),
+        "outtmpl": os.path.join(output_path, f"{filename or title}.%(ext)s"),
+        "quiet": progress is not None,
+        "noprogress": progress is not None,
         "merge_output_format": "mp4",
         # Configuration pour éviter la détection de bot
         "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -76,14 +599,23 @@ def download_video(url, title, output_path, cookies_file=None, browser_cookies=N
         "no_check_certificate": True,
     }
     
-    # Ajouter les cookies si fournis
+    # Ajouter les cookies si fournis. yt-dlp réécrit son cookiefile (sans écriture
+    # atomique) en fin de téléchargement : chaque job travaille sur sa propre copie
+    # pour que les téléchargements parallèles ne corrompent pas le fichier partagé.
+    job_cookies = None
     if cookies_file and os.path.exists(cookies_file):
-        ydl_opts["cookiefile"] = cookies_file
+        fd, job_cookies = tempfile.mkstemp(prefix="cookies-", suffix=".txt")
+        os.close(fd)
+        shutil.copyfile(cookies_file, job_cookies)
+        ydl_opts["cookiefile"] = job_cookies
         print(f"[!] Utilisation du fichier cookies: {cookies_file}")
     elif browser_cookies:
         ydl_opts["cookiesfrombrowser"] = (browser_cookies, None, None, None)
         print(f"[!] Utilisation des cookies du navigateur: {browser_cookies}")
-    
+
+    if progress is not None:
+        ydl_opts["progress_hooks"] = [progress.hook(title)]
+
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             ydl.download([url])
@@ -91,9 +623,137 @@ def download_video(url, title, output_path, cookies_file=None, browser_cookies=N
         print(f"[✗] Erreur lors du téléchargement de {title}: {e}")
         print("[!] Essayez d'utiliser --cookies-from-browser chrome ou --cookies cookies.txt")
         return False
+    finally:
+        if job_cookies:
+            try:
+                os.remove(job_cookies)
+            except OSError:
+                pass
     return True
 
 
+def download_videos(jobs, workers=DOWNLOAD_WORKERS, cookies_file=None, browser_cookies=None,
+                    profile=DEFAULT_PROFILE):
+    """
+    Télécharge les bandes-annonces `jobs` [(url, titre, dossier, nom de fichier)] avec au
+    plus `workers` yt-dlp en parallèle ; chaque job garde les pauses (sleep_interval) de
+    download_video. Le titre ne sert qu'aux messages de progression.
+    Renvoie le nombre de téléchargements réussis.
+    """
+    if not jobs:
+        return 0
+    progress = DownloadProgress()
+    ok = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(download_video, url, title, output_path, cookies_file, browser_cookies, progress,
+                            profile, filename): title
+            for url, title, output_path, filename in jobs
+        }
+        for future in as_completed(futures):
+            title = futures[future]
+            try:
+                success = future.result()
+            except Exception as e:
+                print(f"[✗] Erreur lors du téléchargement de {title}: {e}")
+                success = False
+            if success:
+                ok += 1
+                print(f"[✓] Téléchargée : {title} ({ok}/{len(jobs)})", flush=True)
+    progress.summary(ok)
+    return ok
+
+
+class TrailerLibrary:
+    """
+    Bibliothèque commune des bandes-annonces (bandes_annonces/library/), indexée par
+    identifiant YouTube et par titre normalisé (library/index.json).
+
+    Chaque vidéo n'est téléchargée qu'une fois, sous <id YouTube>.<ext> ; les dossiers
+    de semaine contiennent des liens physiques « <titre>.<ext> » vers la bibliothèque
+    (copie si le système de fichiers ne les permet pas). Un film reconduit d'une semaine
+    sur l'autre ne coûte ainsi ni quota, ni téléchargement, ni disque.
+    """
+
+    def __init__(self, root=os.path.join(DOWNLOAD_PATH, LIBRARY_DIRNAME)):
+        self.root = Path(root)
+        self.index_path = self.root / "index.json"
+        self.videos = {}  # id YouTube (ou "titre-…" pour un fichier adopté) -> nom de fichier
+        self.titles = {}  # titre normalisé -> id
+        if self.index_path.exists():
+            try:
+                with self.index_path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.videos = data.get("videos", {})
+                self.titles = data.get("titles", {})
+            except (OSError, ValueError) as e:
+                print(f"[!] Index de la bibliothèque illisible, reconstruit : {e}")
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        save_json_if_changed(self.index_path, {"videos": self.videos, "titles": self.titles})
+
+    @staticmethod
+    def _is_trailer_file(path, video_id):
+        # <id>.<ext> exactement : un flux séparé laissé par une fusion ratée (<id>.f137.mp4)
+        # n'a qu'une piste et ne doit jamais passer pour la bande-annonce
+        return path.stem == video_id and path.suffix.lower() in TRAILER_EXTENSIONS
+
+    def file_for(self, video_id):
+        """Fichier de la vidéo dans la bibliothèque, s'il existe (y compris juste après un téléchargement)."""
+        name = self.videos.get(video_id)
+        if name and (self.root / name).exists() and (
+                video_id.startswith("titre-") or self._is_trailer_file(self.root / name, video_id)):
+            return self.root / name
+        for candidate in self.root.glob(f"{glob.escape(video_id)}.*"):
+            if self._is_trailer_file(candidate, video_id):
+                self.videos[video_id] = candidate.name
+                return candidate
+        self.videos.pop(video_id, None)
+        return None
+
+    def lookup(self, title):
+        """Bande-annonce déjà connue pour ce titre (quelle que soit la semaine), sinon None."""
+        video_id = self.titles.get(normalize_title(title))
+        return self.file_for(video_id) if video_id else None
+
+    def remember(self, title, video_id):
+        self.titles[normalize_title(title)] = video_id
+
+    def adopt(self, title, path):
+        """Intègre à la bibliothèque une bande-annonce déjà présente dans un dossier de semaine."""
+        norm = normalize_title(title)
+        if not norm or self.lookup(title) is not None:
+            return
+        key = f"titre-{hashlib.sha1(norm.encode('utf-8')).hexdigest()[:16]}"
+        target = self.root / f"{key}{Path(path).suffix}"
+        self.root.mkdir(parents=True, exist_ok=True)
+        if not target.exists():
+            _link_or_copy(Path(path), target)
+        self.videos[key] = target.name
+        self.titles[norm] = key
+
+    def link_into(self, source, output_path, title):
+        """Place la bande-annonce `source` dans le dossier de semaine sous le nom du film."""
+        dest = Path(output_path) / f"{title}{source.suffix}"
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if not dest.exists():
+            _link_or_copy(source, dest)
+        return dest
+
+
+def _link_or_copy(source, dest):
+    try:
+        os.link(source, dest)
+    except OSError:
+        shutil.copy2(source, dest)
+
+
+def video_id_from_url(url):
+    match = re.search(r"[?&]v=([\w-]{6,})", url or "")
+    return match.group(1) if match else None
+
+
 def load_titles(path):
     if os.path.isfile(path):
         with open(path, "r", encoding="utf-8") as f:
@@ -108,6 +768,21 @@ def load_titles_for_date(date_obj):
     return load_titles(f"films/{annee}-S{num_semaine}.txt")
 
 
+def load_films_for_date(date_obj):
+    """
+    Films de la semaine sous forme de dicts {"titre", "distributeur", ...} :
+    depuis films/YYYY-SWW.json (get_prog_from_distrib.py) si présent,
+    sinon depuis la liste de titres films/YYYY-SWW.txt (sans distributeur).
+    """
+    annee = date_obj.strftime("%Y")
+    num_semaine = date_obj.strftime("%V")
+    json_path = f"films/{annee}-S{num_semaine}.json"
+    if os.path.isfile(json_path):
+        with open(json_path, "r", encoding="utf-8") as f:
+            return [film for film in json.load(f) if film.get("titre")]
+    return [{"titre": title, "distributeur": None} for title in load_titles_for_date(date_obj)]
+
+
 def load_channels(path):
     if not path:
         print("Fichier des chaines Youtube non trouvé")
@@ -119,13 +794,32 @@ def load_channels(path):
 def main(args):
 
     allowed_channels = load_channels(args.channels)
+    search_cache = SearchCache(ttl=0 if args.refresh_search else SEARCH_TTL_DAYS * 86400,
+                               negative_ttl=0 if args.refresh_search else SEARCH_NEGATIVE_TTL_DAYS * 86400)
+    channel_index = None
+    if allowed_channels and not args.no_channel_index:
+        channel_index = ChannelIndex(allowed_channels)
+        try:
+            channel_index.refresh()
+        except Exception as e:
+            # Quota épuisé, réseau... : l'index existant reste utilisable tel quel
+            print(f"[!] Rafraîchissement de l'index des chaînes impossible, index existant utilisé : {e}")
+
+    library = TrailerLibrary()
 
     # détermine les fichiers à parcourir : on commence par la semaine courante
     date_obj = datetime.now()
 
-    titles = load_titles_for_date(date_obj)
-    while len(titles) > 0:
-        for title in titles:
+    # 1) bibliothèque puis recherches (séquentielles : quota et caches partagés),
+    # 2) téléchargements en parallèle vers la bibliothèque, 3) liens dans les semaines
+    jobs = {}  # id YouTube -> (url, [(titre, dossier de semaine)])
+    # Passe à False si l'API échoue (quota épuisé...) : les bandes-annonces déjà
+    # trouvées sont quand même téléchargées et liées
+    searching = True
+    films = load_films_for_date(date_obj)
+    while len(films) > 0:
+        for film in films:
+            title = film["titre"]
             if args.output:
                 output_path = args.output
             else:
@@ -135,14 +829,60 @@ def main(args):
             bande_annonce = glob.glob(f"{output_path}/{title}.*")
             if bande_annonce:
                 print(f"Bande-annonce de {title} déjà téléchargée.")
+                library.adopt(title, bande_annonce[0])
+                continue
+
+            known = library.lookup(title)
+            if known is not None:
+                library.link_into(known, output_path, title)
+                print(f"[=] Bande-annonce de {title} reprise de la bibliothèque ({known.name}).")
+                continue
+            queued = library.titles.get(normalize_title(title))
+            if queued in jobs:
+                # Film présent sur plusieurs semaines : un seul téléchargement
+                jobs[queued][1].append((title, output_path))
+                continue
+
+            if not searching:
+                continue
+            preferred = distributor_channels(film.get("distributeur"), allowed_channels)
+            try:
+                url = search_trailer(title, allowed_channels, preferred, cache=search_cache, index=channel_index)
+            except Exception as e:
+                print(f"[!] Recherche YouTube interrompue à {title} : {e}")
+                print("[!] Les bandes-annonces déjà trouvées sont téléchargées ; relancez plus tard pour les autres.")
+                searching = False
+                continue
+            search_cache.save()
+            video_id = video_id_from_url(url)
+            if not video_id:
+                continue
+            library.remember(title, video_id)
+            known = library.file_for(video_id)
+            if known is not None:
+                library.link_into(known, output_path, title)
+                print(f"[=] Bande-annonce de {title} déjà dans la bibliothèque ({known.name}).")
             else:
-                url = search_trailer(title, allowed_channels)
-                if url:
-                    download_video(url, title, output_path, args.cookies, args.browser_cookies)
+                jobs.setdefault(video_id, (url, []))[1].append((title, output_path))
 
         # puis on passe à la semaine suivante
         date_obj += timedelta(weeks=1)
-        titles = load_titles_for_date(date_obj)
+        films = load_films_for_date(date_obj)
+
+    if channel_index is not None:
+        # Identifiants de chaînes relevés pendant les recherches globales
+        channel_index.save()
+
+    # Fichier nommé d'après l'id YouTube (partagé par les semaines), messages d'après le film
+    download_videos([(url, targets[0][0], str(library.root), video_id) for video_id, (url, targets) in jobs.items()],
+                    args.workers, args.cookies, args.browser_cookies, args.profile)
+    for video_id, (_, targets) in jobs.items():
+        source = library.file_for(video_id)
+        if source is None:
+            continue
+        for title, output_path in targets:
+            library.link_into(source, output_path, title)
+    library.save()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Téléchargeur de bandes-annonces YouTube")
@@ -153,6 +893,14 @@ if __name__ == "__main__":
     parser.add_argument("--browser-cookies", required=False, 
                         choices=["chrome", "firefox", "safari", "edge"],
                         help="Utiliser les cookies du navigateur (chrome, firefox, safari, edge)")
+    parser.add_argument("--refresh-search", action="store_true",
+                        help="Ignore le cache des recherches YouTube (les résultats sont mis à jour)")
+    parser.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS,
+                        help=f"Téléchargements simultanés (défaut: {DOWNLOAD_WORKERS})")
+    parser.add_argument("--profile", choices=sorted(OUTPUT_PROFILES), default=DEFAULT_PROFILE,
+                        help=f"Résolution et codecs visés (défaut: {DEFAULT_PROFILE}, H.264 + AAC)")
+    parser.add_argument("--no-channel-index", action="store_true",
+                        help="N'utilise pas l'index des vidéos des chaînes autorisées (recherche globale uniquement)")
 
     args = parser.parse_args()
     main(args)
@@ -1,18 +1,32 @@
 
 from __future__ import annotations
 
+import argparse
 import json
-import shutil
-import subprocess
-import sys
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
 from pathlib import Path
 from typing import Tuple, Dict, Any, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
+from common import HttpCache
+
 SEANCES_DIRNAME = "seances"
+DEFAULT_WORKERS = 4
+
+# Champs extraits de la fiche film et recopiés dans le JSON de séances
+FICHE_FIELDS = ("description", "realisateur", "genre", "duree_minutes", "acteurs")
+FALLBACK_MIN_CHARS = 80  # longueur minimale d'un paragraphe pour passer pour un synopsis
+_REALISATEUR_RE = re.compile(r"^un film d[e']\s*(.+)$", flags=re.IGNORECASE)
+_DUREE_H_RE = re.compile(r"\b(\d{1,2})\s*h\s*(\d{2})?\b", flags=re.IGNORECASE)
+_DUREE_MIN_RE = re.compile(r"\b(\d{2,3})\s*min", flags=re.IGNORECASE)
+
+# Cache HTTP partagé : les fiches inchangées ne coûtent qu'un 304
+_HTTP_CACHE = HttpCache()
 
 def _iso_year_week_today() -> Tuple[int, int]:
     today = date.today()
@@ -53,82 +67,243 @@ def _save_seances_json(seances_path: Path, data: list) -> None:
     with seances_path.open("w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
-def get_description(url_fiche: str) -> str:
-    """Renvoie la description de la fiche associée à l'URL."""
-    try:
-        response = requests.get(url_fiche)
-        response.raise_for_status()  # Lève une exception pour les codes d'état HTTP d'erreur
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Supprimer les scripts et les styles
-        for script_or_style in soup(["script", "style"]):
-            script_or_style.extract()
-
-        # Extraire le texte et le nettoyer
-        text = soup.get_text(separator=' ', strip=True)
-        
-        # Conserver une mise en page simple en remplaçant les doubles sauts de ligne
-        # par des sauts de ligne simples et en nettoyant les espaces multiples.
-        cleaned_text = '\n'.join(line.strip() for line in text.splitlines() if line.strip())
-        return cleaned_text
-    except requests.exceptions.RequestException as e:
-        print(f"Erreur lors de la requête HTTP vers {url_fiche}: {e}")
-        return ""
-    except Exception as e:
-        print(f"Erreur lors de l'extraction de la description de {url_fiche}: {e}")
-        return ""
+def _clean_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text.replace("\u00A0", " ")).strip()
 
-def process_week(base_dir: Path, week_str: str) -> None:
-    seances_path = base_dir / SEANCES_DIRNAME / f"{week_str}.json"
-    if not seances_path.exists():
-        print(f"[INFO] Aucun fichier trouvé pour {week_str} -> arrêt.", flush=True)
-        return
 
-    print(f"[INFO] Traitement de la semaine {week_str} ({seances_path})", flush=True)
+def _parse_duree_minutes(text: str) -> Optional[int]:
+    """'(1h20)' -> 80, '1 h 05' -> 65, '95 min' -> 95."""
+    m = _DUREE_H_RE.search(text)
+    if m:
+        return int(m.group(1)) * 60 + int(m.group(2) or 0)
+    m = _DUREE_MIN_RE.search(text)
+    if m:
+        return int(m.group(1))
+    return None
 
-    items = _load_seances_json(seances_path)
-    if not items:
-        print(f"[WARN] Aucun élément dans {seances_path}", flush=True)
-        return
 
-    for idx, item in enumerate(items, start=1):
-        url_fiche_raw = item.get("url_fiche")
-        if url_fiche_raw:
-            url_fiche = url_fiche_raw.replace("\\", "/")
-        else:
-            url_fiche = None
+def _parse_film_detail(detail) -> Dict[str, Any]:
+    """
+    Parse le bloc .film-detail d'une fiche : une <section> par rubrique,
+    le premier <p> servant de libellé ("Avec", "Synopsis", "Séances"),
+    sauf la première rubrique (réalisateur puis "genre / ... / (durée)").
+    """
+    fiche: Dict[str, Any] = {}
+    for section in detail.find_all("section"):
+        paragraphs = [_clean_text(p.get_text(" ", strip=True)) for p in section.find_all("p")]
+        paragraphs = [p for p in paragraphs if p]
+        if not paragraphs:
+            continue
+        label = paragraphs[0].lower()
 
-        print(f"Trouvé URL fiche {url_fiche}", flush=True)
-        if url_fiche:
-            item["description"] = get_description(url_fiche)
+        if label == "synopsis":
+            fiche["description"] = "\n".join(paragraphs[1:])
+        elif label == "avec":
+            acteurs = ", ".join(paragraphs[1:])
+            fiche["acteurs"] = [a.strip() for a in acteurs.split(",") if a.strip()]
+        elif label.startswith("séance") or label.startswith("seance"):
+            continue
         else:
-            item["description"] = ""
+            for line in paragraphs:
+                m = _REALISATEUR_RE.match(line)
+                if m:
+                    fiche["realisateur"] = m.group(1).strip()
+                    continue
+                # Ligne "Comédie / Famille à partir de 8 ans / (1h20)"
+                duree = _parse_duree_minutes(line)
+                if duree is not None:
+                    fiche["duree_minutes"] = duree
+                parts = [part.strip() for part in line.split("/")]
+                genre = [part for part in parts if part and _parse_duree_minutes(part) is None]
+                if genre and not fiche.get("genre"):
+                    fiche["genre"] = " / ".join(genre)
+    return fiche
+
+
+def _fallback_synopsis(soup: BeautifulSoup) -> str:
+    """
+    Heuristique si la mise en page attendue est absente : méta-description,
+    sinon le plus long paragraphe de la page (le synopsis, pas les menus).
+    """
+    for attrs in ({"property": "og:description"}, {"name": "description"}):
+        meta = soup.find("meta", attrs=attrs)
+        if meta and meta.get("content", "").strip():
+            return _clean_text(meta["content"])
+
+    best = ""
+    for p in soup.find_all("p"):
+        text = _clean_text(p.get_text(" ", strip=True))
+        if len(text) > len(best):
+            best = text
+    return best if len(best) >= FALLBACK_MIN_CHARS else ""
 
-    # Mise à jour du JSON de séances avec le chemin complet du fichier généré
+
+def parse_fiche(html: str) -> Dict[str, Any]:
+    """
+    Extrait d'une fiche film les champs structurés FICHE_FIELDS :
+    description (synopsis seul), realisateur, genre, duree_minutes et acteurs.
+    Les champs introuvables valent None.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    for script_or_style in soup(["script", "style"]):
+        script_or_style.extract()
+
+    fiche: Dict[str, Any] = {}
+    detail = soup.select_one(".film-detail")
+    if detail is not None:
+        fiche = _parse_film_detail(detail)
+    if not fiche.get("description"):
+        fiche["description"] = _fallback_synopsis(soup)
+
+    return {key: fiche.get(key) for key in FICHE_FIELDS}
+
+
+def get_fiche(url_fiche: str, cache: Optional[HttpCache] = None) -> Dict[str, Any]:
+    """Renvoie les champs structurés de la fiche associée à l'URL ({} en cas d'échec)."""
     try:
-        _save_seances_json(seances_path, items)
-        print(f"[INFO] Élément {idx}: JSON mis à jour (file_youtube={item['file_youtube']}).", flush=True)
+        # Lève une exception pour les codes d'état HTTP d'erreur
+        response = (cache or _HTTP_CACHE).get(url_fiche)
+        return parse_fiche(response.text)
+    except requests.exceptions.RequestException as e:
+        print(f"Erreur lors de la requête HTTP vers {url_fiche}: {e}")
+        return {}
     except Exception as e:
-        print(f"[WARN] Élément {idx}: échec de mise à jour du JSON: {e}", flush=True)
+        print(f"Erreur lors de l'extraction de la description de {url_fiche}: {e}")
+        return {}
 
 
-def main() -> int:
-    base_dir = Path(__file__).resolve().parent
+def get_description(url_fiche: str, cache: Optional[HttpCache] = None) -> str:
+    """Renvoie la description (synopsis) de la fiche associée à l'URL."""
+    return get_fiche(url_fiche, cache).get("description") or ""
 
-    year, week = _iso_year_week_today()
 
-    # Avance semaine par semaine jusqu'à rencontrer la première semaine sans JSON, puis s'arrête.
-    first_missing = False
-    while not first_missing:
+def _normalize_url_fiche(url_fiche_raw: Optional[str]) -> Optional[str]:
+    if not url_fiche_raw:
+        return None
+    return url_fiche_raw.replace("\\", "/")
+
+
+def _pending_weeks(base_dir: Path) -> List[str]:
+    """Semaine courante puis suivantes, jusqu'à la première semaine sans JSON."""
+    weeks = []
+    year, week = _iso_year_week_today()
+    while True:
         wstr = _week_str(year, week)
         seances_path = base_dir / SEANCES_DIRNAME / f"{wstr}.json"
         if not seances_path.exists():
             print(f"[INFO] Aucun fichier de séances pour {wstr}. Arrêt.", flush=True)
-            first_missing = True
-        else:
-            process_week(base_dir, wstr)
-            year, week = _next_iso_year_week(year, week)
+            return weeks
+        weeks.append(wstr)
+        year, week = _next_iso_year_week(year, week)
+
+
+def _make_session(workers: int) -> requests.Session:
+    """Session avec un pool de connexions keep-alive dimensionné pour `workers` threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_fiches(urls: List[str], workers: int = DEFAULT_WORKERS,
+                 cache: Optional[HttpCache] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Récupère en parallèle (au plus `workers` requêtes simultanées) la fiche
+    de chaque URL. Renvoie {url: champs de la fiche} ({} en cas d'échec).
+    """
+    if not urls:
+        return {}
+    if cache is None:
+        cache = HttpCache(session=_make_session(workers))
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(get_fiche, url, cache): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            results[url] = future.result()
+            print(f"[OK] Fiche {url} ({len(results)}/{len(urls)})", flush=True)
+    return results
+
+
+def _has_fiche(item: Dict[str, Any]) -> bool:
+    """Vrai si le film a déjà une description au format structuré."""
+    return bool(item.get("description")) and all(key in item for key in FICHE_FIELDS)
+
+
+def process_weeks(base_dir: Path, week_strs: List[str], force: bool = False,
+                  workers: int = DEFAULT_WORKERS) -> None:
+    """
+    Renseigne la description et les champs de fiche (FICHE_FIELDS) pour tous
+    les films des semaines données :
+    - collecte les URLs de fiche de toutes les semaines et les dédoublonne
+      (un film à l'affiche trois semaines n'est récupéré qu'une fois) ;
+    - ignore les films déjà décrits, sauf si force=True ;
+    - récupère les fiches en parallèle sur une session partagée ;
+    - réécrit chaque fichier de semaine une seule fois, et seulement s'il a changé.
+    """
+    weeks: Dict[str, Tuple[Path, List[Dict[str, Any]]]] = {}
+    pending_urls: Dict[str, None] = {}  # dict pour garder l'ordre d'apparition
 
+    for week_str in week_strs:
+        seances_path = base_dir / SEANCES_DIRNAME / f"{week_str}.json"
+        if not seances_path.exists():
+            print(f"[INFO] Aucun fichier trouvé pour {week_str} -> ignoré.", flush=True)
+            continue
+        items = _load_seances_json(seances_path)
+        if not items:
+            print(f"[WARN] Aucun élément dans {seances_path}", flush=True)
+            continue
+        weeks[week_str] = (seances_path, items)
+
+        for item in items:
+            url_fiche = _normalize_url_fiche(item.get("url_fiche"))
+            if url_fiche and (force or not _has_fiche(item)):
+                pending_urls[url_fiche] = None
+
+    print(f"[INFO] {len(pending_urls)} fiche(s) à récupérer pour {len(weeks)} semaine(s).", flush=True)
+    fiches = fetch_fiches(list(pending_urls), workers=workers)
+
+    for week_str, (seances_path, items) in weeks.items():
+        changed = False
+        for item in items:
+            url_fiche = _normalize_url_fiche(item.get("url_fiche"))
+            fiche = fiches.get(url_fiche) if url_fiche else None
+            # Une récupération en échec ({}) n'écrase pas une description existante
+            if fiche and fiche.get("description"):
+                for key in FICHE_FIELDS:
+                    if item.get(key) != fiche[key] or key not in item:
+                        item[key] = fiche[key]
+                        changed = True
+            elif "description" not in item:
+                item["description"] = ""
+                changed = True
+
+        if not changed:
+            print(f"[INFO] {week_str}: descriptions déjà à jour.", flush=True)
+            continue
+        try:
+            _save_seances_json(seances_path, items)
+            print(f"[INFO] {week_str}: JSON mis à jour ({seances_path}).", flush=True)
+        except Exception as e:
+            print(f"[WARN] {week_str}: échec de mise à jour du JSON: {e}", flush=True)
+
+
+def process_week(base_dir: Path, week_str: str, force: bool = False) -> None:
+    process_weeks(base_dir, [week_str], force=force)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Récupère les descriptions des films à l'affiche")
+    parser.add_argument("--force", action="store_true",
+                        help="Récupère aussi les films déjà décrits")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Nombre de requêtes simultanées (défaut: {DEFAULT_WORKERS})")
+    args = parser.parse_args(argv)
+
+    base_dir = Path(__file__).resolve().parent
+    process_weeks(base_dir, _pending_weeks(base_dir), force=args.force, workers=max(1, args.workers))
     return 0
 
 
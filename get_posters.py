@@ -1,17 +1,41 @@
 # Python
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
 import mimetypes
 import os
+import re
+import shutil
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from common import sanitize_filename
+from common import POSTER_VARIANTS, file_digest, poster_variant, sanitize_filename, save_json_if_changed
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow est optionnel : pas de dédoublonnage perceptuel
+    Image = None
+
+DEFAULT_WORKERS = 8
+DEFAULT_PER_HOST = 4
+CHUNK_SIZE = 64 * 1024
+STORE_DIRNAME = "store"  # posters/store/ : un fichier par visuel distinct
+PHASH_MAX_DISTANCE = 4   # bits de dHash différents tolérés pour un même visuel
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+MANIFEST_FILENAME = "manifest.json"  # posters/manifest.json : état par semaine
+WEEK_STEM_PATTERN = re.compile(r"^(\d{4})-S(\d{2})$")
 
 
 def extension_from_url(url: str) -> str:
@@ -50,20 +74,24 @@ def extension_from_content_type(content_type: Optional[str]) -> str:
     return ext or ""
 
 
-def ensure_unique_path(path: Path) -> Path:
+def image_is_valid(path: Path) -> bool:
     """
-    Si un fichier existe déjà, ajoute un suffixe ' (1)', ' (2)', etc.
+    Vrai si `path` est une image complète et décodable (fichier non vide sans Pillow).
+    Un fichier tronqué par un transfert interrompu est ainsi détecté.
     """
-    if not path.exists():
-        return path
-    stem, suffix = path.stem, path.suffix
-    parent = path.parent
-    counter = 1
-    while True:
-        candidate = parent / f"{stem} ({counter}){suffix}"
-        if not candidate.exists():
-            return candidate
-        counter += 1
+    try:
+        if path.stat().st_size == 0:
+            return False
+    except OSError:
+        return False
+    if Image is None:
+        return True
+    try:
+        with Image.open(path) as img:
+            img.load()
+    except Exception:
+        return False
+    return True
 
 
 def download_poster(url: str, dest_path: Path, session: Optional[requests.Session] = None) -> Path:
@@ -71,114 +99,522 @@ def download_poster(url: str, dest_path: Path, session: Optional[requests.Sessio
     Télécharge le contenu de `url` vers `dest_path`.
     Si dest_path n'a pas d'extension, tente de la déterminer via Content-Type.
     Retourne le chemin final écrit.
+
+    Le transfert se fait dans `<dest_path>.part` : la taille reçue est comparée au
+    Content-Length, l'image est décodée, puis le fichier est renommé atomiquement.
+    Un .part laissé par un transfert interrompu est repris (Range / If-Range) au
+    lancement suivant ; si le fichier a changé sur le serveur, il est retéléchargé.
     """
     s = session or requests.Session()
     headers = {
         "User-Agent": "Mozilla/5.0 (compatible; PosterFetcher/1.0)"
     }
 
-    # Déterminer l'extension depuis l'URL si manquante
+    part_path = dest_path.with_name(dest_path.name + ".part")
+    part_meta_path = dest_path.with_name(dest_path.name + ".part.json")
+    part_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Reprise d'un transfert partiel, seulement si on sait vérifier que la ressource n'a pas changé
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    validator = None
+    if offset and part_meta_path.exists():
+        try:
+            with part_meta_path.open("r", encoding="utf-8") as f:
+                part_meta = json.load(f)
+            if part_meta.get("url") == url:
+                validator = part_meta.get("validator")
+        except (OSError, ValueError):
+            validator = None
+    if offset and validator:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+    else:
+        offset = 0
+
     final_path = dest_path
-    if not final_path.suffix:
-        # On tentera de fixer après HEAD/GET si possible
-        pass
 
     # Faire une requête GET en streaming
     with s.get(url, headers=headers, timeout=30, stream=True) as resp:
+        if resp.status_code == 416:
+            # Plage refusée : le .part ne correspond plus à la ressource, on repart de zéro
+            part_path.unlink(missing_ok=True)
+            part_meta_path.unlink(missing_ok=True)
+            return download_poster(url, dest_path, session=s)
         resp.raise_for_status()
 
+        resumed = resp.status_code == 206 and offset > 0
+        if not resumed:
+            offset = 0
+
         # Si aucune extension, essayer de la déduire du Content-Type
         if not final_path.suffix:
             ext = extension_from_content_type(resp.headers.get("Content-Type"))
             if ext:
                 final_path = final_path.with_suffix(ext)
 
-        # S'assurer de l'unicité du nom
-        final_path = ensure_unique_path(final_path)
+        content_length = resp.headers.get("Content-Length")
+        expected = offset + int(content_length) if content_length and content_length.isdigit() else None
+
+        new_validator = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+        if new_validator:
+            part_meta_path.write_text(json.dumps({"url": url, "validator": new_validator}), encoding="utf-8")
+        else:
+            part_meta_path.unlink(missing_ok=True)
 
         # Écrire par chunks
-        final_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(final_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
+        with open(part_path, "ab" if resumed else "wb") as f:
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
                 if chunk:
                     f.write(chunk)
 
+    received = part_path.stat().st_size
+    if expected is not None and received != expected:
+        # On garde le .part : le prochain lancement reprendra là où on s'est arrêté
+        raise IOError(f"transfert incomplet ({received}/{expected} octets)")
+    if not image_is_valid(part_path):
+        part_path.unlink(missing_ok=True)
+        part_meta_path.unlink(missing_ok=True)
+        raise ValueError("image invalide ou tronquée")
+
+    os.replace(part_path, final_path)
+    part_meta_path.unlink(missing_ok=True)
     return final_path
 
 
-def process_json_file(json_path: Path, posters_root: Path, session: requests.Session) -> None:
+def _dhash(path: Path) -> Optional[str]:
     """
-    Lit un fichier JSON et télécharge les posters dans posters_root/<nom_json_sans_ext>/.
-    Ajoute pour chaque objet un attribut "file_poster" pointant vers le chemin local du fichier.
+    Empreinte perceptuelle (dHash 64 bits) : deux visuels identiques à des
+    résolutions/compressions différentes donnent des empreintes très proches.
+    Le ratio largeur/hauteur est ajouté pour ne pas confondre deux formats différents.
+    None si Pillow est absent, l'image illisible ou trop uniforme pour être comparée.
+    """
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as img:
+            ratio = img.width / img.height
+            pixels = img.convert("L").resize((9, 8)).tobytes()
+    except Exception:
+        return None
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    # Image unie ou presque : l'empreinte ne dit rien du visuel
+    if not 8 <= bin(bits).count("1") <= 56:
+        return None
+    return f"{bits:016x}:{ratio:.2f}"
+
+
+def _same_visual(a: str, b: str) -> bool:
+    bits_a, ratio_a = a.split(":")
+    bits_b, ratio_b = b.split(":")
+    return (ratio_a == ratio_b
+            and bin(int(bits_a, 16) ^ int(bits_b, 16)).count("1") <= PHASH_MAX_DISTANCE)
+
+
+class PosterStore:
+    """
+    Stockage des posters adressé par contenu, partagé par toutes les semaines.
+
+    Chaque visuel distinct est stocké une fois sous posters/store/<sha256><ext>.
+    L'index (posters/store/index.json) associe chaque URL au fichier stocké et
+    chaque fichier à son empreinte perceptuelle et aux titres qui l'utilisent :
+    la même affiche servie sous une autre URL, ou recompressée, n'est pas
+    conservée deux fois. Le rapprochement perceptuel se limite au même titre
+    (deux films aux affiches voisines ne partagent qu'un contenu identique).
+    Les dossiers de semaine contiennent des liens physiques vers le stock
+    (copie en dernier recours si le système de fichiers ne les permet pas).
     """
-    subdir = posters_root / json_path.stem
-    subdir.mkdir(parents=True, exist_ok=True)
 
+    def __init__(self, posters_root: Path):
+        self.root = posters_root / STORE_DIRNAME
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+        self.urls: Dict[str, str] = {}   # url -> nom du fichier stocké
+        self.phash: Dict[str, str] = {}  # nom du fichier stocké -> dHash
+        self.titles: Dict[str, List[str]] = {}  # nom du fichier stocké -> titres normalisés
+        if self.index_path.exists():
+            try:
+                with self.index_path.open("r", encoding="utf-8") as f:
+                    index = json.load(f)
+                self.urls = index.get("urls", {})
+                self.phash = index.get("phash", {})
+                self.titles = index.get("titles", {})
+            except (OSError, ValueError) as e:
+                print(f"[AVERTISSEMENT] Index du stock illisible, reconstruit: {e}", file=sys.stderr)
+
+    def save(self) -> None:
+        with self._lock:
+            save_json_if_changed(self.index_path, {"urls": self.urls, "phash": self.phash, "titles": self.titles})
+
+    def lookup_url(self, url: str) -> Optional[Path]:
+        """Fichier stocké pour cette URL, s'il existe encore."""
+        with self._lock:
+            name = self.urls.get(url)
+        if name and (self.root / name).exists():
+            return self.root / name
+        return None
+
+    def tmp_path(self, url: str, ext: str) -> Path:
+        """Chemin de téléchargement stable pour une URL, pour pouvoir reprendre un transfert interrompu."""
+        return self.root / "tmp" / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}{ext}"
+
+    def add(self, url: str, file_path: Path, titre: str, keep_source: bool = False) -> Path:
+        """
+        Intègre le poster de `titre` au stock (déplacé, ou copié si keep_source) et
+        renvoie le fichier stocké. Si le même contenu, ou un visuel perceptuellement
+        identique du même titre, est déjà stocké, c'est ce fichier existant qui est renvoyé.
+        """
+        digest = hashlib.sha256(file_path.read_bytes()).hexdigest()
+        name = f"{digest}{file_path.suffix.lower()}"
+        phash = _dhash(file_path)
+        title_key = sanitize_filename(titre).casefold()
+
+        with self._lock:
+            if not (self.root / name).exists():
+                duplicate = None
+                if phash is not None:
+                    duplicate = next((known for known, h in self.phash.items()
+                                      if title_key in self.titles.get(known, ())
+                                      and _same_visual(h, phash) and (self.root / known).exists()), None)
+                if duplicate is not None:
+                    name = duplicate
+                else:
+                    if keep_source:
+                        shutil.copy2(file_path, self.root / name)
+                    else:
+                        os.replace(file_path, self.root / name)
+                    if phash is not None:
+                        self.phash[name] = phash
+            self.urls[url] = name
+            if title_key not in self.titles.setdefault(name, []):
+                self.titles[name].append(title_key)
+
+        if not keep_source and file_path.exists() and file_path.parent != self.root:
+            file_path.unlink()
+        return self.root / name
+
+    @staticmethod
+    def link(stored: Path, dest: Path) -> Path:
+        """Place `stored` en `dest` (lien physique, sinon copie) et renvoie dest."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            if os.path.samefile(stored, dest):
+                return dest
+            dest.unlink()
+        try:
+            os.link(stored, dest)
+        except OSError:
+            shutil.copy2(stored, dest)
+        return dest
+
+
+@dataclass
+class PosterJob:
+    """Un poster manquant à télécharger une fois, et les fichiers de semaine qui y font référence."""
+    url: str
+    titre: str
+    # (dossier de semaine, nom sans extension, élément JSON)
+    targets: List[Tuple[Path, str, Dict[str, Any]]] = field(default_factory=list)
+
+
+def _load_week_items(json_path: Path) -> Optional[List[Any]]:
     try:
         with open(json_path, "r", encoding="utf-8") as f:
             data = json.load(f)
     except Exception as e:
         print(f"[ERREUR] Impossible de lire {json_path.name}: {e}", file=sys.stderr)
-        return
+        return None
 
     if not isinstance(data, list):
         print(f"[AVERTISSEMENT] Le JSON racine de {json_path.name} n'est pas un tableau. Ignoré.", file=sys.stderr)
-        return
-
-    changed = False
+        return None
+    return data
+
+
+def _existing_poster(subdir: Path, safe_name: str, ext: str) -> Optional[Path]:
+    """Poster déjà présent pour ce nom, y compris s'il a été enregistré avec une autre extension."""
+    if ext:
+        candidate = subdir / f"{safe_name}{ext}"
+        return candidate if candidate.exists() else None
+    for image_ext in IMAGE_EXTENSIONS:
+        candidate = subdir / f"{safe_name}{image_ext}"
+        if candidate.exists():
+            return candidate
+    return None
 
-    for idx, item in enumerate(data, start=1):
-        if not isinstance(item, dict):
-            print(f"[AVERTISSEMENT] Élément #{idx} de {json_path.name} n'est pas un objet. Ignoré.", file=sys.stderr)
-            continue
 
-        titre = item.get("titre")
-        url = item.get("url_poster")
+def plan_downloads(json_files: List[Path], posters_root: Path,
+                   store: PosterStore) -> Tuple[Dict[Path, List[Any]], List[PosterJob]]:
+    """
+    Lit tous les fichiers de semaine et planifie les téléchargements.
+    - Une URL déjà dans le stock est simplement liée dans le dossier de la semaine.
+    - Un poster déjà présent dans la semaine (ancien format) est intégré au stock.
+    - Les autres deviennent des PosterJob, un seul par URL quel que soit le nombre de semaines.
+    Renvoie ({fichier JSON: éléments}, jobs).
+    """
+    weeks: Dict[Path, List[Any]] = {}
+    jobs: Dict[str, PosterJob] = {}
 
-        if not titre or not url:
-            print(f"[AVERTISSEMENT] Élément #{idx} de {json_path.name} sans 'titre' ou 'url_poster'. Ignoré.", file=sys.stderr)
+    for json_path in json_files:
+        data = _load_week_items(json_path)
+        if data is None:
             continue
-
-        safe_name = sanitize_filename(titre)
-
-        # Conserver l'extension d'origine de l'URL si disponible
-        ext = extension_from_url(url)
-        dest = subdir / f"{safe_name}{ext}"
-
-        final_path: Path | None = None
-
-        # Si un fichier avec le même nom existe, on saute (déjà téléchargé) mais on renseigne "file_poster"
-        if dest.exists():
-            final_path = dest
-            print(f"[INFO] Déjà présent: {dest.relative_to(posters_root)}")
-        else:
-            # Si pas d'extension dans l'URL, `download_poster` tentera via Content-Type
+        weeks[json_path] = data
+        subdir = posters_root / json_path.stem
+
+        for idx, item in enumerate(data, start=1):
+            if not isinstance(item, dict):
+                print(f"[AVERTISSEMENT] Élément #{idx} de {json_path.name} n'est pas un objet. Ignoré.", file=sys.stderr)
+                continue
+
+            titre = item.get("titre")
+            url = item.get("url_poster")
+
+            if not titre or not url:
+                print(f"[AVERTISSEMENT] Élément #{idx} de {json_path.name} sans 'titre' ou 'url_poster'. Ignoré.", file=sys.stderr)
+                continue
+
+            safe_name = sanitize_filename(titre)
+
+            stored = store.lookup_url(url)
+            if stored is None:
+                # Conserver l'extension d'origine de l'URL si disponible
+                existing = _existing_poster(subdir, safe_name, extension_from_url(url))
+                if existing is not None and not image_is_valid(existing):
+                    print(f"[AVERTISSEMENT] Poster tronqué ou illisible, retéléchargé: {existing}", file=sys.stderr)
+                    existing.unlink()
+                    existing = None
+                if existing is not None:
+                    stored = store.add(url, existing, titre, keep_source=True)
+
+            if stored is not None:
+                dest = store.link(stored, subdir / f"{safe_name}{stored.suffix}")
+                item["file_poster"] = str(dest)
+                continue
+
+            job = jobs.get(url)
+            if job is None:
+                job = jobs[url] = PosterJob(url=url, titre=titre)
+            job.targets.append((subdir, safe_name, item))
+
+    return weeks, list(jobs.values())
+
+
+def _make_session(workers: int) -> requests.Session:
+    """Session keep-alive partagée, avec un pool de connexions dimensionné pour `workers` threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "*/*"})
+    return session
+
+
+def download_all(jobs: List[PosterJob], posters_root: Path, session: requests.Session, store: PosterStore,
+                 workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST) -> None:
+    """
+    Télécharge les jobs en parallèle (au plus `workers` au total et `per_host` par hôte)
+    vers le stock, les lie dans chaque semaine concernée, affiche le temps de chaque
+    fichier et renseigne "file_poster" dans les éléments concernés.
+    """
+    if not jobs:
+        return
+    host_slots: Dict[str, threading.BoundedSemaphore] = {}
+    for job in jobs:
+        host = urlparse(job.url).netloc
+        if host not in host_slots:
+            host_slots[host] = threading.BoundedSemaphore(per_host)
+
+    def run(job: PosterJob) -> Tuple[Path, float]:
+        with host_slots[urlparse(job.url).netloc]:
+            start = time.perf_counter()
+            tmp = download_poster(job.url, store.tmp_path(job.url, extension_from_url(job.url)), session=session)
+            elapsed = time.perf_counter() - start
+        return store.add(job.url, tmp, job.titre), elapsed
+
+    total_start = time.perf_counter()
+    total_bytes = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
             try:
-                final_path = download_poster(url, dest, session=session)
-                rel = final_path.relative_to(posters_root)
-                print(f"[OK] {rel}")
+                stored, elapsed = future.result()
             except requests.HTTPError as e:
-                print(f"[ERREUR HTTP] {json_path.name} :: '{titre}': {e}", file=sys.stderr)
+                print(f"[ERREUR HTTP] '{job.titre}': {e}", file=sys.stderr)
+                continue
             except requests.RequestException as e:
-                print(f"[ERREUR RÉSEAU] {json_path.name} :: '{titre}': {e}", file=sys.stderr)
+                print(f"[ERREUR RÉSEAU] '{job.titre}': {e}", file=sys.stderr)
+                continue
             except Exception as e:
-                print(f"[ERREUR] {json_path.name} :: '{titre}': {e}", file=sys.stderr)
+                print(f"[ERREUR] '{job.titre}': {e}", file=sys.stderr)
+                continue
+
+            size = stored.stat().st_size
+            total_bytes += size
+            for subdir, safe_name, item in job.targets:
+                dest = store.link(stored, subdir / f"{safe_name}{stored.suffix}")
+                item["file_poster"] = str(dest)
+                print(f"[OK] {dest.relative_to(posters_root)} ({elapsed:.2f} s, {size // 1024} Kio)")
+
+    elapsed = time.perf_counter() - total_start
+    print(f"[INFO] {len(jobs)} poster(s), {total_bytes // 1024} Kio en {elapsed:.2f} s")
+
+
+def build_variants(weeks: Dict[Path, List[Any]], posters_root: Path, workers: int = DEFAULT_WORKERS) -> None:
+    """
+    Génère les variantes (POSTER_VARIANTS) de chaque poster des semaines traitées.
+    Les posters partagés (même contenu) ne sont dérivés qu'une fois ; les variantes
+    déjà présentes ne coûtent qu'un test d'existence.
+    """
+    sources: Dict[str, Path] = {}
+    for items in weeks.values():
+        for item in items:
+            if not isinstance(item, dict) or not item.get("file_poster"):
+                continue
+            path = Path(item["file_poster"])
+            if path.exists():
+                sources.setdefault(file_digest(path), path)
+    if not sources:
+        return
 
-        # Si on a un chemin de fichier valide, on met à jour l'objet JSON
-        if final_path is not None:
-            item["file_poster"] = str(final_path)
-            changed = True
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for source in sources.values():
+            for variant in POSTER_VARIANTS:
+                executor.submit(poster_variant, source, variant, posters_root)
+    print(f"[INFO] Variantes de {len(sources)} poster(s) à jour en {time.perf_counter() - start:.2f} s")
 
-    # Si des éléments ont été mis à jour, on réécrit le fichier JSON
-    if changed:
+
+def save_weeks(weeks: Dict[Path, List[Any]]) -> None:
+    """Réécrit chaque fichier de semaine une seule fois, et seulement si son contenu a changé."""
+    for json_path, data in weeks.items():
         try:
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            save_json_if_changed(json_path, data)
         except Exception as e:
             print(f"[ERREUR] Impossible d'écrire {json_path.name}: {e}", file=sys.stderr)
 
 
-def main() -> None:
+def _week_key(stem: str) -> Optional[Tuple[int, int]]:
+    match = WEEK_STEM_PATTERN.match(stem)
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def _input_hash(items: List[Any]) -> str:
+    """Empreinte des entrées qui déterminent les posters d'une semaine : (titre, url_poster)."""
+    pairs = sorted(
+        (str(item.get("titre") or ""), str(item.get("url_poster") or ""))
+        for item in items if isinstance(item, dict)
+    )
+    return hashlib.sha256(json.dumps(pairs, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _week_complete(items: List[Any]) -> bool:
+    """Vrai si chaque film ayant une URL de poster a son fichier local."""
+    for item in items:
+        if not isinstance(item, dict) or not item.get("titre") or not item.get("url_poster"):
+            continue
+        file_poster = item.get("file_poster")
+        if not file_poster or not Path(file_poster).exists():
+            return False
+    return True
+
+
+class WeekManifest:
+    """
+    État de traitement des semaines (posters/manifest.json) :
+    {"<semaine>": {"input_hash", "size", "mtime", "complete", "processed_at"}}.
+
+    Les semaines passées déjà traitées ne sont plus relues : taille et mtime du JSON
+    suffisent à voir qu'il n'a pas bougé ; s'il a bougé, seule l'empreinte des
+    (titre, url_poster) décide s'il faut le reprendre.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.weeks: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            try:
+                with path.open("r", encoding="utf-8") as f:
+                    self.weeks = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[AVERTISSEMENT] Manifeste illisible, toutes les semaines seront traitées: {e}", file=sys.stderr)
+
+    def save(self) -> None:
+        save_json_if_changed(self.path, self.weeks)
+
+    def select(self, json_files: List[Path], today: Optional[date] = None) -> List[Path]:
+        """
+        Semaines à traiter : la semaine courante et les suivantes, puis les semaines
+        passées jamais traitées, incomplètes ou dont les url_poster ont changé.
+        """
+        iso = (today or date.today()).isocalendar()
+        current = (iso[0], iso[1])
+        selected = []
+        for json_path in json_files:
+            key = _week_key(json_path.stem)
+            entry = self.weeks.get(json_path.stem)
+            if key is None or key >= current or entry is None or not entry.get("complete"):
+                selected.append(json_path)
+                continue
+            stat = json_path.stat()
+            if stat.st_size == entry.get("size") and stat.st_mtime == entry.get("mtime"):
+                continue
+            items = _load_week_items(json_path)
+            if items is None:
+                continue
+            if _input_hash(items) != entry.get("input_hash"):
+                selected.append(json_path)
+            else:
+                # Modifié sans toucher aux posters (ex. description) : on retient le nouvel état
+                entry["size"], entry["mtime"] = stat.st_size, stat.st_mtime
+        return selected
+
+    def record(self, weeks: Dict[Path, List[Any]]) -> None:
+        """Enregistre l'état des semaines traitées (à appeler après save_weeks)."""
+        now = datetime.now().isoformat(timespec="seconds")
+        for json_path, items in weeks.items():
+            try:
+                stat = json_path.stat()
+            except OSError:
+                continue
+            self.weeks[json_path.stem] = {
+                "input_hash": _input_hash(items),
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "complete": _week_complete(items),
+                "processed_at": now,
+            }
+
+
+def process_json_file(json_path: Path, posters_root: Path, session: requests.Session) -> None:
+    """
+    Lit un fichier JSON et télécharge les posters dans posters_root/<nom_json_sans_ext>/.
+    Ajoute pour chaque objet un attribut "file_poster" pointant vers le chemin local du fichier.
+    """
+    store = PosterStore(posters_root)
+    weeks, jobs = plan_downloads([json_path], posters_root, store)
+    download_all(jobs, posters_root, session, store)
+    store.save()
+    save_weeks(weeks)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Télécharge les affiches des films des fichiers de séances")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Téléchargements simultanés au total (défaut: {DEFAULT_WORKERS})")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                        help=f"Téléchargements simultanés par hôte (défaut: {DEFAULT_PER_HOST})")
+    parser.add_argument("--all", action="store_true",
+                        help="Traite toutes les semaines, y compris les semaines passées déjà à jour")
+    args = parser.parse_args(argv)
+    workers = max(1, args.workers)
+
     base_dir = Path(__file__).resolve().parent
     seances_dir = base_dir / "seances"
     posters_dir = base_dir / "posters"
@@ -194,14 +630,26 @@ def main() -> None:
         print(f"[INFO] Aucun fichier JSON trouvé dans {seances_dir}")
         return
 
-    with requests.Session() as session:
-        session.headers.update({"Accept": "*/*"})
-        for json_path in json_files:
-            print(f"[TRAITEMENT] {json_path.name}")
-            process_json_file(json_path, posters_dir, session=session)
+    manifest = WeekManifest(posters_dir / MANIFEST_FILENAME)
+    if not args.all:
+        total = len(json_files)
+        json_files = manifest.select(json_files)
+        print(f"[INFO] {len(json_files)}/{total} semaine(s) à traiter (courantes, futures ou modifiées)")
+
+    # 1) planification sur les semaines retenues, 2) téléchargements parallèles, 3) une écriture par semaine
+    store = PosterStore(posters_dir)
+    weeks, jobs = plan_downloads(json_files, posters_dir, store)
+    print(f"[INFO] {len(weeks)} semaine(s), {len(jobs)} poster(s) à télécharger")
+    with _make_session(workers) as session:
+        download_all(jobs, posters_dir, session, store, workers=workers, per_host=max(1, args.per_host))
+    store.save()
+    build_variants(weeks, posters_dir, workers)
+    save_weeks(weeks)
+    manifest.record(weeks)
+    manifest.save()
 
     print("[TERMINE]")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
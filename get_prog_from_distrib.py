@@ -1,14 +1,26 @@
+import json
 import os
+import re
+from pathlib import Path
 from dotenv import load_dotenv
 import requests
 from bs4 import BeautifulSoup
-from dataclasses import dataclass
-from typing import List
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from common import save_json_if_changed, write_bytes_atomic
 
 
 # Chargement des variables d'environnement
 load_dotenv()
 
+# Cookies de session persistés entre deux exécutions
+COOKIES_PATH = Path(__file__).resolve().parent / "cache" / "cinediffusion_cookies.json"
+CONNECT_TIMEOUT = 5   # secondes
+READ_TIMEOUT = 30     # secondes
+# Lien présent uniquement sur les pages de l'espace adhérents une fois connecté
+AUTHENTICATED_MARKER = "login_out.php"
+
 @dataclass
 class Film:
     titre: str
@@ -20,6 +32,19 @@ class Film:
     version: str
     distributeur: str
     publicite: str
+    duree_minutes: Optional[int] = None
+
+
+def parse_duree(duree: str) -> Optional[int]:
+    """Convertit une durée '02H08' (ou '2h08', '1h') en minutes, None si illisible"""
+    m = re.search(r"(\d{1,2})\s*[hH]\s*(\d{1,2})?", duree or "")
+    if not m:
+        return None
+    return int(m.group(1)) * 60 + int(m.group(2) or 0)
+
+
+def _clean_cell(text: str) -> str:
+    return " ".join(text.split())
 
 
 @dataclass
@@ -28,12 +53,73 @@ class SemaineProgrammation:
     films: List[Film]
 
 class CinemaClient:
-    def __init__(self):
+    def __init__(self, cookies_path: Optional[Path] = COOKIES_PATH):
         self.session = requests.Session()
         self.base_url = "https://www.cinediffusion.fr/espace_adherents"
         self.login_url = f"{self.base_url}/index.php"
         self.program_url = f"{self.base_url}/admin_main.php?section=programmation"
-        
+        self.cookies_path = cookies_path
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+        self.load_cookies()
+
+    def load_cookies(self) -> bool:
+        """Recharge les cookies de la session précédente s'ils existent"""
+        if not self.cookies_path or not self.cookies_path.exists():
+            return False
+        try:
+            with self.cookies_path.open("r", encoding="utf-8") as f:
+                cookies = json.load(f)
+            for c in cookies:
+                self.session.cookies.set(
+                    c["name"], c["value"],
+                    domain=c.get("domain", ""), path=c.get("path", "/"),
+                    expires=c.get("expires"), secure=c.get("secure", False),
+                )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Cookies illisibles ({self.cookies_path}), ignorés: {e}")
+            return False
+        return True
+
+    def save_cookies(self):
+        """Enregistre les cookies de session sur disque (lisibles par l'utilisateur seul)"""
+        if not self.cookies_path:
+            return
+        cookies = [
+            {
+                "name": c.name, "value": c.value, "domain": c.domain,
+                "path": c.path, "expires": c.expires, "secure": c.secure,
+            }
+            for c in self.session.cookies
+        ]
+        # Fichier créé en 0600 puis renommé : ni lisible par les autres, ni tronqué en cas d'arrêt
+        write_bytes_atomic(self.cookies_path, json.dumps(cookies, indent=2).encode("utf-8"), mode=0o600)
+
+    @staticmethod
+    def is_authenticated(html_content: str) -> bool:
+        """Vrai si la page reçue est une page de l'espace adhérents connecté"""
+        return AUTHENTICATED_MARKER in html_content
+
+    def fetch_program_html(self) -> Optional[str]:
+        """
+        Télécharge la page de programmation en réutilisant la session persistée.
+        Cette requête sert aussi de sonde : si la session a expiré, on se reconnecte
+        puis on la relance une seule fois.
+        """
+        response = self.session.get(self.program_url, timeout=self.timeout)
+        if response.ok and self.is_authenticated(response.text):
+            print("Session existante valide, connexion inutile")
+            self.save_cookies()  # le serveur peut avoir prolongé/renouvelé le cookie
+            return response.text
+
+        print("Session absente ou expirée, connexion...")
+        if not self.login():
+            return None
+        response = self.session.get(self.program_url, timeout=self.timeout)
+        if not response.ok:
+            print(f"Échec de la récupération du programme: {response.status_code}")
+            return None
+        return response.text
+
     def login(self):
         """Se connecte à l'espace adhérents"""
         login_data = {
@@ -43,33 +129,44 @@ class CinemaClient:
         }
         
         # On fait d'abord une requête GET pour obtenir les éventuels cookies de session
-        self.session.get(self.login_url)
+        self.session.get(self.login_url, timeout=self.timeout)
         
         # L'URL de connexion correcte est process.php
         login_process_url = f"{self.base_url}/process.php"
-        response = self.session.post(login_process_url, data=login_data)
+        response = self.session.post(login_process_url, data=login_data, timeout=self.timeout)
         
-        if response.ok:
-            print("Connexion réussie")
-            return True
-        else:
+        if not response.ok:
             print(f"Échec de la connexion: {response.status_code}")
             print(f"Contenu de la réponse: {response.text}")
             return False
 
+        # Un 200 ne suffit pas : le formulaire est renvoyé en cas d'identifiants refusés
+        if not self.is_authenticated(response.text):
+            check = self.session.get(self.program_url, timeout=self.timeout)
+            if not (check.ok and self.is_authenticated(check.text)):
+                print("Échec de la connexion: identifiants refusés ou session non établie")
+                return False
+
+        print("Connexion réussie")
+        self.save_cookies()
+        return True
+
     def parse_film_row(self, row):  # Ajout de self
         """Parse une ligne du tableau contenant les informations d'un film"""
         cells = row.find_all('td')
+        duree = cells[1].text.strip()
         return Film(
             titre=cells[0].text.strip(),
-            duree=cells[1].text.strip(),
+            duree=duree,
             art_et_essai=cells[2].text.strip(),
             visa=cells[3].text.strip(),
             support=cells[4].text.strip(),
-            pourcentage=cells[5].text.strip(),
-            version=cells[6].text.strip(),
+            # "50%<br>Mg :" -> "50% Mg :"
+            pourcentage=_clean_cell(cells[5].get_text(" ")),
+            version=_clean_cell(cells[6].text),
             distributeur=cells[7].text.strip(),
-            publicite=cells[8].text.strip()
+            publicite=cells[8].text.strip(),
+            duree_minutes=parse_duree(duree),
         )
 
     def parse_program_html(self, html_content: str) -> List[SemaineProgrammation]:
@@ -110,11 +207,17 @@ class CinemaClient:
             # Créer le répertoire 'films' s'il n'existe pas
             os.makedirs('films', exist_ok=True)
             
-            # Sauvegarder les titres dans un fichier
-            filename = f"films/{annee}-S{num_semaine}.txt"
-            with open(filename, 'w', encoding='utf-8') as f:
-                for film in films:
-                    f.write(f"{film.titre}\n")
+            # Sauvegarder les titres dans un fichier (seulement s'ils ont changé)
+            filename = Path(f"films/{annee}-S{num_semaine}.txt")
+            titres = "".join(f"{film.titre}\n" for film in films)
+            if not filename.exists() or filename.read_text(encoding='utf-8') != titres:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(titres)
+
+            # Version structurée, avec toutes les colonnes (distributeur, durée en minutes...)
+            json_path = Path(f"films/{annee}-S{num_semaine}.json")
+            if save_json_if_changed(json_path, [asdict(film) for film in films]):
+                print(f"Sauvegardé: {json_path}")
 
             program.append(SemaineProgrammation(
                 date=date_semaine,
@@ -140,26 +243,29 @@ class CinemaClient:
 
     def get_program(self):
         """Récupère le programme des films"""
-        response = self.session.get(self.program_url)
-        if response.ok:
-            program = self.parse_program_html(response.text)
-            if program:
-                self.print_program(program)
-                return program
-            else:
-                print("Échec du parsing du programme")
-                return None
+        try:
+            html_content = self.fetch_program_html()
+        except requests.RequestException as e:
+            print(f"Échec de la récupération du programme: {e}")
+            return None
+        if html_content is None:
+            return None
+
+        program = self.parse_program_html(html_content)
+        if program:
+            self.print_program(program)
+            return program
         else:
-            print(f"Échec de la récupération du programme: {response.status_code}")
+            print("Échec du parsing du programme")
             return None
 
 def main():
     client = CinemaClient()
-    if client.login():
-        program = client.get_program()
-        if program:
-            print("Programme récupéré avec succès")
-            # Traitement du programme...
+    # La connexion n'est refaite que si la session persistée a expiré
+    program = client.get_program()
+    if program:
+        print("Programme récupéré avec succès")
+        # Traitement du programme...
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,15 +1,23 @@
+import argparse
 import json
 import locale
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
 import re
 import unicodedata
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urljoin
 
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+from common import HttpCache, content_hash, json_bytes, save_json_if_changed, write_bytes_atomic
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # lxml est optionnel : repli sur html.parser
+    lxml_html = None
 
 def _strip_accents(s: str) -> str:
     # Supprime les diacritiques pour pouvoir faire correspondre "août" et "aout"
@@ -76,10 +84,295 @@ class Film:
         self.seances: list = []
 
 
-class CinemaParadiso:
+# --- backends de parsing de la page programme ---
+
+SEANCES_DIRNAME = "seances"
+CHANGES_DIRNAME = "changes"  # seances/changes/<semaine>.json : liste des changements
+SOURCE_STATE_FILENAME = "source.json"  # seances/changes/source.json : dernière page traitée
+TITLE_TAGS = ("h3", "h4", "h5")
+_SEMAINE_RE = re.compile(r"Semaine du\s+(.+?)\s+au\s+(.+)", flags=re.IGNORECASE)
+
+
+def _clean_spaces(s: str) -> str:
+    return " ".join(s.split())
+
+
+@dataclass
+class FilmBrut:
+    """Film tel qu'extrait d'une section semaine, avant interprétation des horaires."""
+    titre: str
+    url_fiche: Optional[str] = None   # data-src du bouton "Fiche film" (relatif)
+    url_poster: Optional[str] = None  # src de l'affiche (relatif)
+    horaires: List[str] = field(default_factory=list)
+
+
+class _WeekScan:
+    """
+    Accumulateur alimenté par un parcours unique, dans l'ordre du document,
+    des éléments d'une section semaine.
+    Chaque bouton fiche / affiche / horaire est rattaché au dernier titre rencontré.
+    """
+
     def __init__(self):
-        self.base_url = "https://www.cinema-paradiso.asso.fr"
-        self.program_url = f"{self.base_url}/programme"
+        self.titre_semaine: Optional[str] = None
+        self.fallback_semaine: Optional[str] = None
+        self.films: Dict[str, FilmBrut] = {}
+        self._courant: Optional[FilmBrut] = None
+
+    def on_titre_semaine(self, text: str) -> None:
+        if self.titre_semaine is None:
+            self.titre_semaine = _clean_spaces(text)
+
+    def on_text(self, text: str) -> None:
+        # Fallback: n'importe quel texte contenant "Semaine du"
+        if self.fallback_semaine is None and "Semaine du" in text:
+            self.fallback_semaine = _clean_spaces(text)
+
+    def on_titre(self, text: str) -> None:
+        titre = _clean_spaces(text)
+        if not titre:
+            return
+        film = self.films.get(titre)
+        if film is None:
+            film = FilmBrut(titre)
+            self.films[titre] = film
+        self._courant = film
+
+    def on_fiche(self, data_src: Optional[str]) -> None:
+        if self._courant is not None and self._courant.url_fiche is None and data_src:
+            self._courant.url_fiche = data_src
+
+    def on_poster(self, src: Optional[str]) -> None:
+        if self._courant is not None and self._courant.url_poster is None and src:
+            self._courant.url_poster = src
+
+    def on_horaire(self, text: str) -> None:
+        if self._courant is not None:
+            self._courant.horaires.append(_clean_spaces(text))
+
+    def date_debut_text(self) -> Optional[str]:
+        """Date de début extraite de "Semaine du ... au ...", None si absente."""
+        text = self.titre_semaine or self.fallback_semaine
+        if not text:
+            return None
+        m = _SEMAINE_RE.search(text)
+        if not m:
+            return None
+        return m.group(1).strip()
+
+
+class ProgramParser:
+    """
+    Backend de parsing de la page programme.
+    parse_weeks() renvoie une liste de tuples (date_debut_text, {titre: FilmBrut})
+    en un seul parcours ordonné par section semaine.
+    """
+    name = "base"
+
+    def parse_weeks(self, html: str) -> List[Tuple[str, Dict[str, FilmBrut]]]:
+        raise NotImplementedError
+
+    @staticmethod
+    def _collect(scans: List[_WeekScan]) -> List[Tuple[str, Dict[str, FilmBrut]]]:
+        results = []
+        for scan in scans:
+            date_debut_text = scan.date_debut_text()
+            if date_debut_text:
+                results.append((date_debut_text, scan.films))
+        return results
+
+
+class LxmlProgramParser(ProgramParser):
+    """Backend lxml (libxml2) : parsing et parcours en C, nettement plus rapide."""
+    name = "lxml"
+
+    @staticmethod
+    def _text(el) -> str:
+        return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+    def parse_weeks(self, html: str) -> List[Tuple[str, Dict[str, FilmBrut]]]:
+        parser = lxml_html.HTMLParser(encoding="utf-8")
+        doc = lxml_html.document_fromstring(html.encode("utf-8"), parser=parser)
+
+        scans = []
+        for section in doc.iter("section"):
+            scan = _WeekScan()
+            for el in section.iter():
+                tag = el.tag
+                if not isinstance(tag, str):
+                    continue  # commentaires, instructions de traitement
+                if el.text:
+                    scan.on_text(el.text)
+                if el.tail and el is not section:
+                    scan.on_text(el.tail)
+
+                classes = (el.get("class") or "").split()
+                if "titre-semaine" in classes:
+                    scan.on_titre_semaine(self._text(el))
+                if tag in TITLE_TAGS:
+                    scan.on_titre(self._text(el))
+                elif "film-btn" in classes:
+                    if tag == "a":
+                        scan.on_fiche(el.get("data-src"))
+                    elif tag == "img":
+                        scan.on_poster(el.get("src"))
+                elif "horaire" in classes:
+                    scan.on_horaire(self._text(el))
+            scans.append(scan)
+
+        return self._collect(scans)
+
+
+class Bs4ProgramParser(ProgramParser):
+    """Backend BeautifulSoup/html.parser : sans dépendance native, même parcours unique."""
+    name = "html.parser"
+
+    def parse_weeks(self, html: str) -> List[Tuple[str, Dict[str, FilmBrut]]]:
+        soup = BeautifulSoup(html, "html.parser")
+
+        scans = []
+        for section in soup.find_all("section"):
+            scan = _WeekScan()
+            for el in section.descendants:
+                if isinstance(el, NavigableString):
+                    scan.on_text(str(el))
+                    continue
+                if not isinstance(el, Tag):
+                    continue
+
+                classes = el.get("class") or []
+                if "titre-semaine" in classes:
+                    scan.on_titre_semaine(el.get_text(" ", strip=True))
+                if el.name in TITLE_TAGS:
+                    scan.on_titre(el.get_text(" ", strip=True))
+                elif "film-btn" in classes:
+                    if el.name == "a":
+                        scan.on_fiche(el.get("data-src"))
+                    elif el.name == "img":
+                        scan.on_poster(el.get("src"))
+                elif "horaire" in classes:
+                    scan.on_horaire(el.get_text(" ", strip=True))
+            scans.append(scan)
+
+        return self._collect(scans)
+
+
+PARSER_BACKENDS = {
+    LxmlProgramParser.name: LxmlProgramParser,
+    Bs4ProgramParser.name: Bs4ProgramParser,
+}
+
+
+def get_program_parser(name: Optional[str] = None) -> ProgramParser:
+    """
+    Instancie le backend demandé. Par défaut lxml s'il est installé, sinon html.parser.
+    """
+    if name is None:
+        name = LxmlProgramParser.name if lxml_html is not None else Bs4ProgramParser.name
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Backend de parsing inconnu: {name!r} (choix: {', '.join(PARSER_BACKENDS)})")
+    if name == LxmlProgramParser.name and lxml_html is None:
+        raise ValueError("Le backend 'lxml' nécessite le paquet lxml (pip install lxml).")
+    return PARSER_BACKENDS[name]()
+
+
+# --- fusion incrémentale d'une semaine ---
+
+def film_to_item(film: Film) -> Dict[str, Any]:
+    return {
+        "titre": film.titre,
+        "url_poster": film.url_poster,
+        "url_fiche": film.url_fiche,
+        "seances": [s.isoformat() for s in film.seances],
+    }
+
+
+def merge_week(items: List[Dict[str, Any]], films: List[Film]) -> List[Dict[str, Any]]:
+    """
+    Fusionne les films scrapés dans les éléments existants d'une semaine (modifiés en place,
+    les champs ajoutés par les autres étapes sont conservés) et renvoie la liste des changements :
+      - {"titre", "type": "nouveau", "seances"}
+      - {"titre", "type": "modifie", "champs", ["seances_ajoutees", "seances_retirees"]}
+      - {"titre", "type": "retire"} : film absent de la page, conservé et marqué "retire": true
+    L'appariement se fait par un index sur le titre.
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        if isinstance(item, dict) and item.get("titre") is not None:
+            index.setdefault(item["titre"], item)
+
+    changes: List[Dict[str, Any]] = []
+    for film in films:
+        scraped = film_to_item(film)
+        item = index.get(film.titre)
+        if item is None:
+            items.append(scraped)
+            index[film.titre] = scraped
+            changes.append({"titre": film.titre, "type": "nouveau", "seances": scraped["seances"]})
+            continue
+
+        champs = [key for key in ("url_poster", "url_fiche", "seances") if item.get(key) != scraped[key]]
+        if item.pop("retire", False):
+            champs.append("retire")
+        if not champs:
+            continue
+        change: Dict[str, Any] = {"titre": film.titre, "type": "modifie", "champs": champs}
+        if "seances" in champs:
+            anciennes = set(item.get("seances") or [])
+            nouvelles = set(scraped["seances"])
+            change["seances_ajoutees"] = sorted(nouvelles - anciennes)
+            change["seances_retirees"] = sorted(anciennes - nouvelles)
+        item.update(scraped)
+        changes.append(change)
+
+    scraped_titres = {film.titre for film in films}
+    for titre, item in index.items():
+        if titre not in scraped_titres and not item.get("retire"):
+            item["retire"] = True
+            changes.append({"titre": titre, "type": "retire"})
+
+    return changes
+
+
+def load_week_changes(week_str: str, seances_dir: Path = Path(SEANCES_DIRNAME)) -> Optional[Dict[str, Any]]:
+    """
+    Lit la dernière liste de changements émise pour une semaine, None si absente.
+    Les étapes suivantes peuvent comparer son "content_hash" à celui déjà traité
+    et ne refaire que les films listés.
+    """
+    path = seances_dir / CHANGES_DIRNAME / f"{week_str}.json"
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class CinemaScraper:
+    """
+    Interface des scrapers de cinéma (un par site).
+
+    Une sous-classe fournit :
+      - name : identifiant du cinéma (clé du registre, sous-dossier seances/<name>/) ;
+      - base_url / program_url : site et page programme ;
+      - parse_weeks(html) : repère les sections semaine et en extrait les films bruts ;
+      - éventuellement _extract_seance_dt(texte) si les horaires ne sont pas au format
+        "mercredi 13 août 2025 20h30".
+    Le chargement (cache HTTP), la conversion des films et la fusion des JSON sont communs.
+    """
+    name = "base"
+    base_url = ""
+    program_url = ""
+
+    def __init__(self, parser: Optional[str] = None, cache: Optional[HttpCache] = None,
+                 seances_dir: Optional[Path] = None, log_prefix: bool = False):
+        # Nom du backend de parsing HTML demandé, libre d'interprétation par la sous-classe
+        self.parser_name = parser
+        self.cache = cache or HttpCache()
+        self.seances_dir = seances_dir if seances_dir is not None else Path(SEANCES_DIRNAME) / self.name
+        # Préfixe les messages par le nom du cinéma (utile quand plusieurs tournent en parallèle)
+        self.log_prefix = log_prefix
+        # Empreinte de la page distante chargée (None pour un fichier local)
+        self.source_hash: Optional[str] = None
         # Tentative de réglage de locale FR, tolérante selon l'OS
         for loc in ("fr_FR", "fr_FR.UTF-8", "French_France.1252"):
             try:
@@ -88,19 +381,28 @@ class CinemaParadiso:
             except Exception:
                 continue
 
-    def _load_html(self, html_path: Optional[str]) -> str:
+    def _log(self, message: str) -> None:
+        print(f"[{self.name}] {message}" if self.log_prefix else message, flush=True)
+
+    def parse_weeks(self, html: str) -> List[Tuple[str, Dict[str, FilmBrut]]]:
+        """Renvoie [(date_debut_text, {titre: FilmBrut})], une entrée par section semaine."""
+        raise NotImplementedError
+
+    def _load_html(self, html_path: Optional[str], force: bool = False) -> str:
         """
-        Charge le HTML depuis l'URL distante,
+        Charge le HTML depuis l'URL distante (via le cache HTTP conditionnel),
         sinon depuis un fichier local si fourni/existant.
         """
+        self.source_hash = None
         if html_path:
             p = Path(html_path)
             if p.exists():
                 return p.read_text(encoding="utf-8")
 
-        # récupération distante
-        resp = requests.get(self.program_url, timeout=20)
-        resp.raise_for_status()
+        # récupération distante : un 304 ne retélécharge pas la page ; son empreinte
+        # permet de savoir si elle a déjà été traitée pour ce dossier (voir _source_processed)
+        resp = self.cache.get(self.program_url, force=force)
+        self.source_hash = resp.content_hash
         return resp.text
 
         # Fallback: fichier d'exemple si présent
@@ -108,6 +410,36 @@ class CinemaParadiso:
         # if default.exists():
         #     return default.read_text(encoding="utf-8")
 
+    @property
+    def _source_state_path(self) -> Path:
+        return self.seances_dir / CHANGES_DIRNAME / SOURCE_STATE_FILENAME
+
+    def _source_processed(self) -> bool:
+        """
+        Vrai si la page chargée a déjà été entièrement traitée pour CE dossier de séances
+        (même empreinte) et que les fichiers de semaine produits existent toujours.
+        """
+        if self.source_hash is None or not self._source_state_path.exists():
+            return False
+        try:
+            with self._source_state_path.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if state.get("content_hash") != self.source_hash:
+            return False
+        return all((self.seances_dir / f"{week_str}.json").exists() for week_str in state.get("semaines", []))
+
+    def _mark_source_processed(self, week_strs: List[str]) -> None:
+        """Enregistre la page traitée, une fois toutes les semaines sauvegardées."""
+        if self.source_hash is None:
+            return
+        write_bytes_atomic(self._source_state_path, json_bytes({
+            "url": self.program_url,
+            "content_hash": self.source_hash,
+            "semaines": week_strs,
+            "date": datetime.now().isoformat(timespec="seconds"),
+        }))
 
     @staticmethod
     def _clean_spaces(s: str) -> str:
@@ -136,35 +468,22 @@ class CinemaParadiso:
             return None
         return d.replace(hour=hh, minute=mm, second=0, microsecond=0)
 
-    def _find_week_sections(self, soup: BeautifulSoup):
+    def _build_films(self, films_bruts: Dict[str, FilmBrut]) -> List[Film]:
         """
-        Retourne une liste de tuples (section, date_debut_text)
-        en repérant les blocs de semaine et la date de début.
+        Convertit les films bruts d'une semaine en Film (URLs absolues, séances datées et triées).
+        Les films sans aucun horaire exploitable sont ignorés.
         """
-        results = []
-        # Cible prioritaire: éléments avec la classe 'titre-semaine' dans des <section>
-        for section in soup.find_all("section"):
-            titre_elem = section.select_one(".titre-semaine")
-            text = ""
-            if titre_elem:
-                text = self._clean_spaces(titre_elem.get_text(" ", strip=True))
-            else:
-                # Fallback: n'importe quel élément contenant "Semaine du"
-                any_elem = section.find(string=lambda t: t and "Semaine du" in t)
-                if any_elem:
-                    text = self._clean_spaces(str(any_elem))
-
-            if not text:
-                continue
-
-            m = re.search(r"Semaine du\s+(.+?)\s+au\s+(.+)", text, flags=re.IGNORECASE)
-            if not m:
+        films = []
+        for brut in films_bruts.values():
+            seances = [dt for dt in map(self._extract_seance_dt, brut.horaires) if dt]
+            if not seances:
                 continue
-
-            date_debut_text = m.group(1).strip()
-            results.append((section, date_debut_text))
-
-        return results
+            film = Film(brut.titre)
+            film.url_fiche = urljoin(self.base_url, brut.url_fiche) if brut.url_fiche else None
+            film.url_poster = urljoin(self.base_url, brut.url_poster) if brut.url_poster else None
+            film.seances = sorted(seances)
+            films.append(film)
+        return films
 
 
     def _path_or_none(self, p: Optional[str]) -> Optional[Path]:
@@ -184,152 +503,177 @@ class CinemaParadiso:
         return data
 
 
-    def _save_seances_json(self, seances_path: Path, data: list) -> None:
-        """Sauvegarde atomique simple du JSON de séances."""
-        with seances_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
-
-    def parse_program(self, html_path: Optional[str] = None):
-        html = self._load_html(html_path)
-        soup = BeautifulSoup(html, "html.parser")
-
-        semaines = self._find_week_sections(soup)
-        print(f"Trouvé {len(semaines)} semaines...")
-
-        for section, date_debut_text in semaines:
-            print(f"Date de début : {date_debut_text}")
+    def parse_program(self, html_path: Optional[str] = None, force: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Récupère le programme et met à jour un JSON par semaine.
+        Renvoie {semaine: changements} pour les semaines dont le fichier a été réécrit.
+        """
+        all_changes: Dict[str, List[Dict[str, Any]]] = {}
+        html = self._load_html(html_path, force=force)
+        if not force and self._source_processed():
+            self._log("Programme inchangé depuis le dernier passage, rien à faire.")
+            return all_changes
+
+        semaines = self.parse_weeks(html)
+        self._log(f"Trouvé {len(semaines)} semaines...")
+        week_strs: List[str] = []
+        complete = True
+
+        for date_debut_text, films_bruts in semaines:
+            self._log(f"Date de début : {date_debut_text}")
             try:
                 date_debut = self._parse_date_fr(date_debut_text)
             except Exception as e:
-                print(f"Impossible de parser la date de début '{date_debut_text}': {e}")
+                self._log(f"Impossible de parser la date de début '{date_debut_text}': {e}")
+                complete = False
                 continue
 
             num_semaine = date_debut.strftime("%V")
             annee = date_debut.strftime("%Y")
 
-            films_by_titre: dict[str, Film] = {}
+            films = self._build_films(films_bruts)
 
-            # On récupère tous les horaires de la section
-            horaire_divs = section.select(".horaire")
-            for hdiv in horaire_divs:
-                seance_txt = hdiv.get_text(" ", strip=True)
-                dt = self._extract_seance_dt(seance_txt)
-                if not dt:
-                    continue
+            self._log(f"Trouvé {len(films)} films...")
 
-                # On remonte au dernier titre (h5/h4/h3) rencontré avant l'horaire
-                titre_tag = hdiv.find_previous(["h5", "h4", "h3"])
-                if not titre_tag:
-                    continue
+            # Sauvegarde un JSON par semaine, seulement si son contenu change
+            week_str = f"{annee}-S{num_semaine}"
+            changes = self._save_week(week_str, films)
+            week_strs.append(week_str)
+            if changes is not None:
+                all_changes[week_str] = changes
+
+        # Une page partiellement traitée sera reprise au prochain passage
+        if complete:
+            self._mark_source_processed(week_strs)
+        return all_changes
+
+    def _save_week(self, week_str: str, films: List[Film]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fusionne les films dans <seances_dir>/<semaine>.json et ne réécrit le fichier
+        que si son empreinte change. Dans ce cas, la liste des changements est
+        aussi écrite dans <seances_dir>/changes/<semaine>.json et renvoyée ; sinon None.
+        """
+        path = self.seances_dir / f"{week_str}.json"
 
-                titre = self._clean_spaces(titre_tag.get_text(" ", strip=True))
-
-                # Initialise l'entrée film si besoin
-                film = films_by_titre.get(titre)
-
-                if film is None:
-                    # Création du film et récupération de l'URL de fiche via <a class="film-btn" data-src="...">
-                    film = Film(titre)
-
-                    # Cherche un <a class="film-btn" ... data-src="...">
-                    film_btn = None
-                    container = titre_tag
-                    for _ in range(5):
-                        if not container:
-                            break
-                        film_btn = container.find("a", class_="film-btn")
-                        if film_btn:
-                            break
-                        container = container.parent
-
-                    # Fallback: chercher après le titre si non trouvé dans les parents
-                    if not film_btn:
-                        film_btn = titre_tag.find_next("a", class_="film-btn")
-
-                    # Construit l'URL absolue à partir de data-src
-                    data_src = film_btn.get("data-src") if film_btn else None
-                    film.url_fiche = urljoin(self.base_url, data_src) if data_src else None
-
-                    # Cherche un <img class="film-btn" ... src="...">
-                    film_btn = None
-                    container = titre_tag
-                    for _ in range(5):
-                        if not container:
-                            break
-                        film_btn = container.find("img", class_="film-btn")
-                        if film_btn:
-                            break
-                        container = container.parent
-
-                    # Fallback: chercher après le titre si non trouvé dans les parents
-                    if not film_btn:
-                        film_btn = titre_tag.find_next("img", class_="film-btn")
-
-                    # Construit l'URL absolue à partir de data-src
-                    data_src = film_btn.get("src") if film_btn else None
-                    film.url_poster = urljoin(self.base_url, data_src) if data_src else None
-
-                    films_by_titre[titre] = film
-
-                # Ajoute la séance
-                film.seances.append(dt)
-
-            films = list(films_by_titre.values())
-            for f in films:
-                f.seances.sort()
-
-            print(f"Trouvé {len(films)} films...")
-
-            # Sauvegarde un JSON par semaine
-            filename = f"seances/{annee}-S{num_semaine}.json"
-
-            # Vérifie si le JSON est déjà renseigné
-            items = None
-            if Path(filename).exists():
-                items = self._load_seances_json(Path(filename))
-
-            if not items:
-                print(f"Nouveau fichier de séances: {filename}", flush=True)
-                with open(filename, "w", encoding="utf-8") as f:
-                    json.dump(
-                        [
-                            {
-                                "titre": film.titre,
-                                "url_poster": film.url_poster,
-                                "url_fiche": film.url_fiche,
-                                "seances": [s.isoformat() for s in film.seances],
-                            }
-                            for film in films
-                        ],
-                        f,
-                        ensure_ascii=False,
-                        indent=2,
-                    )
-                print(f"Sauvegardé: {filename}")
-
-            else:
-                for film in films:
-                    item = next((i for i in items if film.titre == i["titre"]), None)
-                    if item:
-                        item["url_poster"] = film.url_poster
-                        item["url_fiche"] = film.url_fiche
-                        item["seances"] = [s.isoformat() for s in film.seances]
-                    else:
-                        items.append({
-                                "titre": film.titre,
-                                "url_poster": film.url_poster,
-                                "url_fiche": film.url_fiche,
-                                "seances": [s.isoformat() for s in film.seances],
-                            })
-                self._save_seances_json(Path(filename), items)
+        items: List[Dict[str, Any]] = []
+        if path.exists():
+            items = self._load_seances_json(path)
+        else:
+            self._log(f"Nouveau fichier de séances: {path}")
+
+        changes = merge_week(items, films)
+        if not save_json_if_changed(path, items):
+            self._log(f"Inchangé: {path}")
+            return None
+
+        self._log(f"Sauvegardé: {path} ({len(changes)} changement(s))")
+        write_bytes_atomic(self.seances_dir / CHANGES_DIRNAME / f"{week_str}.json", json_bytes({
+            "semaine": week_str,
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "content_hash": content_hash(json_bytes(items)),
+            "changements": changes,
+        }))
+        return changes
+
+
+class CinemaParadiso(CinemaScraper):
+    name = "paradiso"
+    base_url = "https://www.cinema-paradiso.asso.fr"
+    program_url = f"{base_url}/programme"
+
+    def __init__(self, parser: Optional[str] = None, cache: Optional[HttpCache] = None,
+                 seances_dir: Optional[Path] = None, log_prefix: bool = False):
+        super().__init__(parser=parser, cache=cache, seances_dir=seances_dir, log_prefix=log_prefix)
+        self.parser: ProgramParser = get_program_parser(parser)
+
+    def parse_weeks(self, html: str) -> List[Tuple[str, Dict[str, FilmBrut]]]:
+        return self.parser.parse_weeks(html)
+
+
+# --- registre des scrapers ---
+
+SCRAPERS: Dict[str, type] = {}
+CINEMAS_CONFIG = "config/cinemas.txt"
+
+
+def register_scraper(cls: type) -> type:
+    """Enregistre une sous-classe de CinemaScraper sous son `name` (utilisable en décorateur)."""
+    if cls.name in SCRAPERS and SCRAPERS[cls.name] is not cls:
+        raise ValueError(f"Scraper déjà enregistré sous le nom {cls.name!r}")
+    SCRAPERS[cls.name] = cls
+    return cls
+
+
+register_scraper(CinemaParadiso)
+
+
+def load_cinemas(path: str = CINEMAS_CONFIG) -> List[str]:
+    """Cinémas configurés (un identifiant de scraper par ligne, # pour commenter)."""
+    if not Path(path).is_file():
+        return [CinemaParadiso.name]
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line.split("#", 1)[0].strip() for line in f]
+    return [line for line in lines if line]
+
+
+def _make_scraper(name: str, parser: Optional[str], cache_ttl: float, **kwargs) -> CinemaScraper:
+    if name not in SCRAPERS:
+        raise ValueError(f"Cinéma inconnu: {name!r} (choix: {', '.join(sorted(SCRAPERS))})")
+    return SCRAPERS[name](parser=parser, cache=HttpCache(ttl=cache_ttl), **kwargs)
+
+
+def run_scrapers(names: List[str], parser: Optional[str] = None, cache_ttl: float = 0,
+                 force: bool = False, workers: Optional[int] = None) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """
+    Scrape les cinémas `names` en parallèle (un thread par cinéma, au plus `workers`),
+    chacun écrivant dans seances/<cinema>/YYYY-SWW.json. La page déjà traitée est
+    mémorisée par dossier (seances/<cinema>/changes/source.json) : un cinéma n'est
+    jamais sauté parce qu'un autre dossier a déjà vu la même page.
+    Renvoie {cinema: {semaine: changements}} ; un cinéma en échec n'arrête pas les autres.
+    """
+    # Un même cinéma demandé deux fois écrirait le même dossier depuis deux threads
+    names = list(dict.fromkeys(names))
+    scrapers = [_make_scraper(name, parser, cache_ttl, log_prefix=True) for name in names]
+    results: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    if not scrapers:
+        return results
+
+    with ThreadPoolExecutor(max_workers=workers or len(scrapers)) as executor:
+        futures = {executor.submit(scraper.parse_program, force=force): scraper for scraper in scrapers}
+        for future in as_completed(futures):
+            scraper = futures[future]
+            try:
+                results[scraper.name] = future.result()
+            except Exception as e:
+                print(f"[{scraper.name}] Échec du scraping: {e}", flush=True)
+    return results
 
 
 def main():
-    cinema = CinemaParadiso()
+    parser = argparse.ArgumentParser(description="Récupère le programme des cinémas")
+    parser.add_argument("--parser", choices=sorted(PARSER_BACKENDS), default=None,
+                        help="Backend de parsing HTML (défaut: lxml si installé, sinon html.parser)")
+    parser.add_argument("--cache-ttl", type=float, default=0,
+                        help="Durée (s) pendant laquelle la page en cache est réutilisée sans requête")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore le cache HTTP et retraite le programme même s'il n'a pas changé")
+    parser.add_argument("--cinema", action="append", choices=sorted(SCRAPERS),
+                        help="Cinéma à scraper vers seances/<cinema>/ (répétable)")
+    parser.add_argument("--all", action="store_true",
+                        help=f"Scrape en parallèle tous les cinémas de {CINEMAS_CONFIG} vers seances/<cinema>/")
+    args = parser.parse_args()
+
+    if args.all or args.cinema:
+        names = load_cinemas() if args.all else args.cinema
+        run_scrapers(names, parser=args.parser, cache_ttl=args.cache_ttl, force=args.force)
+        return
+
+    # Mode historique : le Paradiso seul, dans seances/ (lu par les étapes suivantes)
+    cinema = CinemaParadiso(parser=args.parser, cache=HttpCache(ttl=args.cache_ttl),
+                            seances_dir=Path(SEANCES_DIRNAME))
     # Laisse parse_program détecter automatiquement la page distante,
     # sinon le fichier local d'exemple sera utilisé.
-    cinema.parse_program()
+    cinema.parse_program(force=args.force)
 
 
 if __name__ == "__main__":
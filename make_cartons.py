@@ -4,12 +4,12 @@
 import os
 import json
 from pathlib import Path
-import cv2
-import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime, date, timedelta
 import locale
 
+from common import POSTER_VARIANTS, MediaProbe, poster_variant, save_json_if_changed
+
 # Chemins
 PATH_VIDEOS = 'bandes_annonces'
 PATH_POSTERS = 'posters'
@@ -50,8 +50,27 @@ def clean_title(titre):
     return titre.replace("'", " ").replace("?", "").replace(":", "-").replace("\n", " ")
 
 
+# Taille du titre : de TITLE_FONT_MAX à TITLE_FONT_MIN par pas de TITLE_FONT_STEP
+TITLE_FONT_MAX = 75
+TITLE_FONT_MIN = 30
+TITLE_FONT_STEP = 5
+SEANCE_FONT_SIZE = 35
+
+# Dimensions de texte déjà mesurées : (texte, police, taille) -> bbox
+_TEXT_BBOX: dict[tuple[str, str, int], tuple[int, int, int, int]] = {}
+
+
+def text_bbox(draw, text, font):
+    """draw.textbbox((0, 0), ...) mémorisé : le résultat ne dépend que du texte et de la police."""
+    key = (text, font.path, font.size)
+    bbox = _TEXT_BBOX.get(key)
+    if bbox is None:
+        bbox = _TEXT_BBOX[key] = draw.textbbox((0, 0), text, font=font)
+    return bbox
+
+
 def get_title_splitted_if_necessary(titre, draw, img_width, poster_width, font):
-    bbox = draw.textbbox((0, 0), titre, font=font)
+    bbox = text_bbox(draw, titre, font)
     title_width = bbox[2] - bbox[0]
     white_space = img_width - poster_width - CARTON_MARGIN * 4 - title_width
     if white_space < 0:
@@ -68,92 +87,145 @@ def get_min_white_space(dates, base_width, draw, font):
     max_width = 0
     for (jour, heure) in dates:
         seance = '- ' + jour + ' à ' + heure
-        bbox = draw.textbbox((0, 0), seance, font=font)
+        bbox = text_bbox(draw, seance, font)
         width = bbox[2] - bbox[0]
         max_width = max(max_width, width)
     return base_width - max_width
 
 
-def make_carton_for_video(video_path, poster_path, titre, dates_str, semaine_dir):
-    print(f"Traitement de : {video_path}")
-
-    vid = cv2.VideoCapture(video_path)
-    height = int(vid.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    width = int(vid.get(cv2.CAP_PROP_FRAME_WIDTH))
-
-    carton = np.full((height, width, 3), 255, dtype=np.uint8)
-    carton = Image.fromarray(carton)
+class CartonRenderer:
+    """
+    Rendu des cartons avec les ressources chargées une seule fois : polices par
+    taille, logo décodé, dimensions de texte mémorisées (text_bbox). La taille du
+    titre est trouvée par dichotomie sur les tailles TITLE_FONT_MAX..TITLE_FONT_MIN,
+    ce qui donne le même résultat que la réduction pas à pas d'origine.
+    """
 
-    poster_img = Image.open(poster_path)
-    poster_img.thumbnail((width - CARTON_MARGIN * 2, height - CARTON_MARGIN * 2))
-    carton.paste(poster_img, (CARTON_MARGIN, CARTON_MARGIN))
+    def __init__(self, resources_dir=PATH_RESOURCES):
+        self.resources_dir = resources_dir
+        self._fonts: dict[tuple[str, int], ImageFont.FreeTypeFont] = {}
+        self._logo = None
+
+    def font(self, name, size):
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = ImageFont.truetype(os.path.join(self.resources_dir, name), size)
+        return font
+
+    @property
+    def logo(self):
+        if self._logo is None:
+            with Image.open(os.path.join(self.resources_dir, 'logo.jpg')) as img:
+                img.load()
+                self._logo = img.copy()
+        return self._logo
+
+    def fit_title_font(self, titre, draw, available_width):
+        """Plus grande taille (sur la grille de TITLE_FONT_STEP) où le titre tient dans available_width."""
+        sizes = list(range(TITLE_FONT_MIN, TITLE_FONT_MAX + 1, TITLE_FONT_STEP))
+        lo, hi = 0, len(sizes) - 1
+        best = 0  # à défaut, la plus petite taille
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            bbox = text_bbox(draw, titre, self.font('Roboto-Bold.ttf', sizes[mid]))
+            if bbox[2] - bbox[0] <= available_width:
+                best = mid
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        return self.font('Roboto-Bold.ttf', sizes[best])
+
+    def render(self, video_path, poster_path, titre, dates_str, semaine_dir, size=None):
+        """Carton aux dimensions (largeur, hauteur) de la vidéo ; `size` évite de la sonder."""
+        print(f"Traitement de : {video_path}")
+
+        if size is None:
+            info = MediaProbe().probe(video_path)
+            if info is None:
+                raise ValueError(f"dimensions de {video_path} illisibles")
+            size = (info.width, info.height)
+        width, height = size
+
+        carton = Image.new('RGB', (width, height), (255, 255, 255))
+
+        poster_box = (width - CARTON_MARGIN * 2, height - CARTON_MARGIN * 2)
+        # Variante pré-réduite si elle est assez grande pour ce carton, sinon l'original
+        variant_box = POSTER_VARIANTS["carton"][0]
+        if poster_box[0] <= variant_box[0] and poster_box[1] <= variant_box[1]:
+            poster_path = poster_variant(poster_path, "carton")
+        poster_img = Image.open(poster_path)
+        poster_img.thumbnail(poster_box)
+        carton.paste(poster_img, (CARTON_MARGIN, CARTON_MARGIN))
+
+        logo = self.logo
+        carton.paste(logo, (width - CARTON_MARGIN - logo.width, height - CARTON_MARGIN - logo.height))
+
+        draw = ImageDraw.Draw(carton)
+        text_width = width - poster_img.width - CARTON_MARGIN * 4
+
+        font = self.font('Roboto-Bold.ttf', TITLE_FONT_MAX)
+        titre = get_title_splitted_if_necessary(titre, draw, width, poster_img.width, font)
+        font = self.fit_title_font(titre, draw, text_width)
+        bbox = text_bbox(draw, titre, font)
+        title_width = bbox[2] - bbox[0]
+        title_height = bbox[3] - bbox[1]
+        white_space = (text_width - title_width)
+
+        pos = (poster_img.width + CARTON_MARGIN * 3 + white_space / 2, CARTON_MARGIN * 2)
+        draw.text(pos, titre, 'rgb(10,10,10)', font)
+
+        dates = []
+        for date_string in dates_str:
+            dt = datetime.fromisoformat(date_string)
+            # Format : "Samedi 5 octobre"
+            # jour sans zéro : %d donne 05 → on peut convertir en int
+            jour_str = str(int(dt.strftime("%d")))
+            date_str = dt.strftime("%A %B").capitalize()
+            jour = f"{date_str.split()[0]} {jour_str} {date_str.split()[1]}"
+            # Format heure : "20h30"
+            heure = dt.strftime('%Hh%M')
+            dates.append([jour, heure])
+
+        font = self.font('Roboto-Regular.ttf', SEANCE_FONT_SIZE)
+        line = 1
+        if len(dates) == 1:
+            seance = dates[0][0] + ' à ' + dates[0][1]
+            bbox = text_bbox(draw, seance, font)
+            seance_width = bbox[2] - bbox[0]
+            pos = (poster_img.width + CARTON_MARGIN * 3 + (text_width - seance_width) / 2,
+                   title_height + CARTON_MARGIN * 6 * line)
+            draw.text(pos, seance, 'rgb(10,10,10)', font)
+        else:
+            white_space = get_min_white_space(dates, text_width, draw, font)
+            coef_vertical = 3 if len(dates) > 4 else 4
+            for (date, heure) in dates:
+                pos = (
+                    poster_img.width + CARTON_MARGIN * 3 + white_space / 2,
+                    title_height + CARTON_MARGIN * 2 + CARTON_MARGIN * coef_vertical * line
+                )
+                draw.text(pos, f'- {date} à {heure}', 'rgb(10,10,10)', font)
+                line += 1
 
-    logo = Image.open(os.path.join(PATH_RESOURCES, 'logo.jpg'))
-    carton.paste(logo, (width - CARTON_MARGIN - logo.width, height - CARTON_MARGIN - logo.height))
+        # Créer le répertoire de la semaine si nécessaire
+        cartons_semaine_dir = PATH_CARTONS / semaine_dir
+        cartons_semaine_dir.mkdir(parents=True, exist_ok=True)
 
-    font_size = 75
-    font_path_bold = os.path.join(PATH_RESOURCES, 'Roboto-Bold.ttf')
-    font_path_regular = os.path.join(PATH_RESOURCES, 'Roboto-Regular.ttf')
-    font = ImageFont.truetype(font_path_bold, font_size)
-    draw = ImageDraw.Draw(carton)
+        base_name = clean_title(titre)
+        carton_file = cartons_semaine_dir / (base_name + '.png')
+        carton.save(carton_file)
+        return carton_file.resolve()
 
-    titre = get_title_splitted_if_necessary(titre, draw, width, poster_img.width, font)
-    bbox = draw.textbbox((0, 0), titre, font=font)
-    title_width = bbox[2] - bbox[0]
-    title_height = bbox[3] - bbox[1]
-    white_space = (width - poster_img.width - CARTON_MARGIN * 4 - title_width)
 
-    while white_space < 0 and font_size > 30:
-        font_size -= 5
-        font = ImageFont.truetype(font_path_bold, font_size)
-        bbox = draw.textbbox((0, 0), titre, font=font)
-        title_width = bbox[2] - bbox[0]
-        title_height = bbox[3] - bbox[1]
-        white_space = (width - poster_img.width - CARTON_MARGIN * 4 - title_width)
-
-    pos = (poster_img.width + CARTON_MARGIN * 3 + white_space / 2, CARTON_MARGIN * 2)
-    draw.text(pos, titre, 'rgb(10,10,10)', font)
-
-    dates = []
-    for date_string in dates_str:
-        dt = datetime.fromisoformat(date_string)
-        # Format : "Samedi 5 octobre"
-        # jour sans zéro : %d donne 05 → on peut convertir en int
-        jour_str = str(int(dt.strftime("%d")))
-        date_str = dt.strftime("%A %B").capitalize()
-        jour = f"{date_str.split()[0]} {jour_str} {date_str.split()[1]}"
-        # Format heure : "20h30"
-        heure = dt.strftime('%Hh%M')
-        dates.append([jour, heure])
-
-    font = ImageFont.truetype(font_path_regular, 35)
-    line = 1
-    if len(dates) == 1:
-        seance = dates[0][0] + ' à ' + dates[0][1]
-        bbox = draw.textbbox((0, 0), seance, font=font)
-        seance_width = bbox[2] - bbox[0]
-        pos = (poster_img.width + CARTON_MARGIN * 3 + (width - poster_img.width - CARTON_MARGIN * 4 - seance_width) / 2,
-               title_height + CARTON_MARGIN * 6 * line)
-        draw.text(pos, seance, 'rgb(10,10,10)', font)
-    else:
-        white_space = get_min_white_space(dates, width - poster_img.width - CARTON_MARGIN * 4, draw, font)
-        coef_vertical = 3 if len(dates) > 4 else 4
-        for (date, heure) in dates:
-            pos = (
-                poster_img.width + CARTON_MARGIN * 3 + white_space / 2,
-                title_height + CARTON_MARGIN * 2 + CARTON_MARGIN * coef_vertical * line
-            )
-            draw.text(pos, f'- {date} à {heure}', 'rgb(10,10,10)', font)
-            line += 1
+_RENDERER = None
 
-    # Créer le répertoire de la semaine si nécessaire
-    cartons_semaine_dir = PATH_CARTONS / semaine_dir
-    cartons_semaine_dir.mkdir(parents=True, exist_ok=True)
 
-    base_name = clean_title(titre)
-    carton_file = cartons_semaine_dir / (base_name + '.png')
-    carton.save(carton_file)
-    return carton_file.resolve()
+def make_carton_for_video(video_path, poster_path, titre, dates_str, semaine_dir, size=None):
+    """Rendu d'un carton avec le CartonRenderer partagé du processus."""
+    global _RENDERER
+    if _RENDERER is None:
+        _RENDERER = CartonRenderer()
+    return _RENDERER.render(video_path, poster_path, titre, dates_str, semaine_dir, size)
 
 
 def get_videos_dir_from_date(date_obj):
@@ -201,32 +273,213 @@ def _score_similarity(a: str, b: str) -> float:
     return 0.6 * ratio + 0.4 * jaccard
 
 
+POSTER_MATCH_THRESHOLD = 0.55
+POSTER_TRIGRAM_SHORTLIST = 0.5  # part des trigrammes du titre à partager, à défaut d'un mot commun
+
+
+def _trigrams(norm: str) -> set[str]:
+    # Sur le titre sans espaces : "spider man" et "spiderman" partagent tous leurs trigrammes
+    compact = norm.replace(" ", "")
+    if len(compact) < 3:
+        return {compact} if compact else set()
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+class PosterMatcher:
+    """
+    Rapprochement bande-annonce -> poster pour une semaine. Chaque nom de poster est
+    normalisé une fois et indexé par mots et par trigrammes ; seuls les posters
+    partageant un mot, ou une bonne part des trigrammes, avec le titre cherché sont
+    notés par _score_similarity (même score et même seuil qu'auparavant).
+    """
+
+    def __init__(self, poster_paths: list[str]):
+        self.paths = poster_paths
+        self.norms = [_normalize_title(os.path.splitext(os.path.basename(p))[0]) for p in poster_paths]
+        self.by_token: dict[str, set[int]] = {}
+        self.by_trigram: dict[str, set[int]] = {}
+        for i, norm in enumerate(self.norms):
+            for token in norm.split():
+                self.by_token.setdefault(token, set()).add(i)
+            for trigram in _trigrams(norm):
+                self.by_trigram.setdefault(trigram, set()).add(i)
+
+    def shortlist(self, target_norm: str) -> set[int]:
+        found: set[int] = set()
+        for token in target_norm.split():
+            found |= self.by_token.get(token, set())
+        trigrams = _trigrams(target_norm)
+        if trigrams:
+            counts: dict[int, int] = {}
+            for trigram in trigrams:
+                for i in self.by_trigram.get(trigram, ()):
+                    counts[i] = counts.get(i, 0) + 1
+            needed = max(1, int(len(trigrams) * POSTER_TRIGRAM_SHORTLIST))
+            found |= {i for i, n in counts.items() if n >= needed}
+        return found
+
+    def best(self, video_base_name: str):
+        target_norm = _normalize_title(video_base_name)
+        best_path = None
+        best_score = 0.0
+        # Parcours dans l'ordre du glob : à score égal, le même poster qu'avant est retenu
+        for i in sorted(self.shortlist(target_norm)):
+            score = _score_similarity(target_norm, self.norms[i])
+            if score > best_score:
+                best_score = score
+                best_path = self.paths[i]
+        return best_path if best_path and best_score >= POSTER_MATCH_THRESHOLD else None
+
+
+# Index par semaine, reconstruit si le dossier des posters change
+_POSTER_MATCHERS: dict[str, tuple[int, PosterMatcher]] = {}
+
+
 def find_best_poster_path(semaine_dir: str, video_base_name: str):
-    import os
     import glob
     posters_dir = os.path.join(PATH_POSTERS, semaine_dir)
     if not os.path.isdir(posters_dir):
         return None
 
-    candidates = glob.glob(os.path.join(posters_dir, "*.jpg"))
-    if not candidates:
+    mtime = os.stat(posters_dir).st_mtime_ns
+    cached = _POSTER_MATCHERS.get(posters_dir)
+    if cached is None or cached[0] != mtime:
+        candidates = glob.glob(os.path.join(posters_dir, "*.jpg"))
+        cached = _POSTER_MATCHERS[posters_dir] = (mtime, PosterMatcher(candidates))
+    matcher = cached[1]
+    if not matcher.paths:
         return None
+    return matcher.best(video_base_name)
 
-    target_norm = _normalize_title(video_base_name)
-    best_path = None
-    best_score = 0.0
-    for poster_path in candidates:
-        poster_name = os.path.splitext(os.path.basename(poster_path))[0]
-        poster_norm = _normalize_title(poster_name)
-        score = _score_similarity(target_norm, poster_norm)
-        if score > best_score:
-            best_score = score
-            best_path = poster_path
 
-    return best_path if best_path and best_score >= 0.55 else None
+# --- récupérer le titre et les dates depuis le fichier de séance en fonction du poster ---
 
+def _norm_filename(name: str) -> str:
+    return os.path.splitext(os.path.basename(str(name)))[0].lower().strip()
+
+
+def _iter_items(d):
+    if isinstance(d, list):
+        for it in d:
+            yield it
+    elif isinstance(d, dict):
+        # Listes possibles dans différents champs
+        for key in ('films', 'seances', 'items', 'programme', 'program'):
+            lst = d.get(key)
+            if isinstance(lst, list):
+                for it in lst:
+                    yield it
+        # Cas dict d'objets
+        for v in d.values():
+            if isinstance(v, dict) and any(k in v for k in ('file_poster', 'title', 'titre')):
+                yield v
+
+
+class WeekSeances:
+    """
+    seances/<semaine_dir>.json lu une seule fois pour tout le traitement de la semaine,
+    indexé par nom de poster (sans extension, insensible à la casse) : sert les
+    recherches de titre de chaque bande-annonce puis l'écriture finale des chemins.
+    """
+
+    def __init__(self, semaine_dir: str):
+        self.semaine_dir = semaine_dir
+        self.path = Path('seances') / f'{semaine_dir}.json'
+        self.data = None
+        self.load_error: Exception | None = None
+        try:
+            with self.path.open('r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except FileNotFoundError as e:
+            self.load_error = e
+        except Exception as e:
+            print(f"[!] Impossible de lire {self.path}: {e}")
+            self.load_error = e
+
+        self.by_poster: dict[str, list[dict]] = {}
+        for item in _iter_items(self.data):
+            if not isinstance(item, dict):
+                continue
+            poster_candidate = (
+                item.get('file_poster') or
+                item.get('poster_file') or
+                item.get('poster') or
+                item.get('filePoster')
+            )
+            if poster_candidate:
+                self.by_poster.setdefault(_norm_filename(poster_candidate), []).append(item)
+
+    def title_for_poster(self, poster_path: str):
+        """
+        Titre (champs acceptés: 'title', 'titre', 'name', 'nom') et séances de l'objet dont
+        'file_poster' correspond au nom du poster ; None si non trouvé.
+        """
+        for item in self.by_poster.get(_norm_filename(poster_path), ()):
+            for title_key in ('title', 'titre', 'name', 'nom'):
+                title_val = item.get(title_key)
+                if isinstance(title_val, str) and title_val.strip():
+                    return title_val.strip(), item.get('seances')
+        return None
+
+    def write_updates(self, updates: list[dict]) -> None:
+        """
+        Ajoute pour chaque film les champs 'file_bandeannonce' et 'file_carton' et réécrit
+        le fichier (une seule fois, et seulement si son contenu change).
+
+        updates: liste de dicts du type:
+          {
+            "titre": "<Titre séance>",
+            "file_bandeannonce": "<chemin absolu vers la BA utilisée>",
+            "file_carton": "<chemin absolu vers le carton .png généré>"
+          }
+        """
+        if isinstance(self.load_error, FileNotFoundError):
+            print(f"[WARN] Fichier non trouvé: {self.path}. Création d'un nouveau.")
+            data = []
+        elif self.load_error is not None:
+            raise self.load_error
+        elif not isinstance(self.data, list):
+            print(f"[WARN] Contenu inattendu dans {self.path}, remplacement par une liste.")
+            data = []
+        else:
+            data = self.data
+
+        # Indexer par titre pour mise à jour rapide
+        by_title: dict[str, dict] = {}
+        order: list[str] = []
+        for item in data:
+            if isinstance(item, dict):
+                t = item.get("titre")
+                if t is not None:
+                    by_title[t] = item
+                    order.append(t)
+
+        # Appliquer les mises à jour
+        for upd in updates:
+            titre = upd["titre"]
+            ba = upd["file_bandeannonce"]
+            carton = upd["file_carton"]
+            if titre in by_title:
+                by_title[titre]["file_bandeannonce"] = ba
+                by_title[titre]["file_carton"] = carton
+            else:
+                # Titre absent: on l'ajoute avec un minimum d'infos
+                by_title[titre] = {
+                    "titre": titre,
+                    "seances": [],
+                    "file_bandeannonce": ba,
+                    "file_carton": carton,
+                }
+                order.append(titre)
+
+        # Reconstruire la liste dans l'ordre d'origine + nouveaux à la fin
+        self.data = [by_title[t] for t in order]
+        self.load_error = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        save_json_if_changed(self.path, self.data)
+        print(f"[OK] Mise à jour des chemins dans {self.path}")
 
-# --- récupérer le titre et les dates depuis le fichier de séance en fonction du poster ---
 
 def _get_title_from_seance_by_poster(semaine_dir: str, poster_path: str):
     """
@@ -234,64 +487,10 @@ def _get_title_from_seance_by_poster(semaine_dir: str, poster_path: str):
     correspond au nom du poster (avec ou sans extension, insensible à la casse),
     et renvoie son titre (champs acceptés: 'title', 'titre', 'name', 'nom').
     Retourne None si non trouvé ou si le fichier n'existe pas.
+    Pour plusieurs recherches dans la même semaine, utiliser WeekSeances directement.
     """
-    import json
+    return WeekSeances(semaine_dir).title_for_poster(poster_path)
 
-    seance_file = os.path.join('seances', f'{semaine_dir}.json')
-    if not os.path.isfile(seance_file):
-        return None
-
-    try:
-        with open(seance_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"[!] Impossible de lire {seance_file}: {e}")
-        return None
-
-    def norm_filename(name: str) -> str:
-        return os.path.splitext(os.path.basename(str(name)))[0].lower().strip()
-
-    target = norm_filename(poster_path)
-
-    def iter_items(d):
-        if isinstance(d, list):
-            for it in d:
-                yield it
-        elif isinstance(d, dict):
-            # Listes possibles dans différents champs
-            for key in ('films', 'seances', 'items', 'programme', 'program'):
-                lst = d.get(key)
-                if isinstance(lst, list):
-                    for it in lst:
-                        yield it
-            # Cas dict d'objets
-            for v in d.values():
-                if isinstance(v, dict) and any(k in v for k in ('file_poster', 'title', 'titre')):
-                    yield v
-
-    for item in iter_items(data):
-        if not isinstance(item, dict):
-            continue
-        poster_candidate = (
-            item.get('file_poster') or
-            item.get('poster_file') or
-            item.get('poster') or
-            item.get('filePoster')
-        )
-        if not poster_candidate:
-            continue
-        if norm_filename(poster_candidate) != target:
-            continue
-
-        for title_key in ('title', 'titre', 'name', 'nom'):
-            title_val = item.get(title_key)
-            if isinstance(title_val, str) and title_val.strip():
-                return title_val.strip(), item.get('seances')
-
-    return None
-
-
-# --- process_all_videos: utilise maintenant le titre du fichier de séance comme base_name ---
 
 # -----------------------------------------------------------
 # Nouveau: mise à jour du fichier seances/<semaine_dir>.json
@@ -300,88 +499,36 @@ def _get_title_from_seance_by_poster(semaine_dir: str, poster_path: str):
 def _update_seances_json(semaine_dir: str, updates: list[dict]) -> None:
     """
     Met à jour seances/<semaine_dir>.json en ajoutant pour chaque film
-    les champs 'file_bandeannonce' et 'file_carton'.
-
-    Paramètres:
-      - semaine_dir: ex. "2025-S35"
-      - updates: liste de dicts du type:
-          {
-            "titre": "<Titre séance>",
-            "file_bandeannonce": "<chemin absolu vers la BA utilisée>",
-            "file_carton": "<chemin absolu vers le carton .png généré>"
-          }
+    les champs 'file_bandeannonce' et 'file_carton' (voir WeekSeances.write_updates).
     """
-    json_path = Path("seances") / f"{semaine_dir}.json"
-    try:
-        with json_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-            if not isinstance(data, list):
-                print(f"[WARN] Contenu inattendu dans {json_path}, remplacement par une liste.")
-                data = []
-    except FileNotFoundError:
-        print(f"[WARN] Fichier non trouvé: {json_path}. Création d'un nouveau.")
-        data = []
-
-    # Indexer par titre pour mise à jour rapide
-    by_title: dict[str, dict] = {}
-    order: list[str] = []
-    for item in data:
-        if isinstance(item, dict):
-            t = item.get("titre")
-            if t is not None:
-                by_title[t] = item
-                order.append(t)
-
-    # Appliquer les mises à jour
-    for upd in updates:
-        titre = upd["titre"]
-        ba = upd["file_bandeannonce"]
-        carton = upd["file_carton"]
-        if titre in by_title:
-            by_title[titre]["file_bandeannonce"] = ba
-            by_title[titre]["file_carton"] = carton
-        else:
-            # Titre absent: on l'ajoute avec un minimum d'infos
-            by_title[titre] = {
-                "titre": titre,
-                "seances": [],
-                "file_bandeannonce": ba,
-                "file_carton": carton,
-            }
-            order.append(titre)
-
-    # Reconstruire la liste dans l'ordre d'origine + nouveaux à la fin
-    new_list = [by_title[t] for t in order]
-
-    with json_path.open("w", encoding="utf-8") as f:
-        json.dump(new_list, f, ensure_ascii=False, indent=2)
-    print(f"[OK] Mise à jour des chemins dans {json_path}")
+    WeekSeances(semaine_dir).write_updates(updates)
 
 # ----------------------------------------------------------------
 # Dans votre logique principale, pendant le traitement d’une semaine
 # ----------------------------------------------------------------
 
-def process_all_videos():
-    from datetime import datetime, timedelta
-    import os
+def plan_carton_jobs() -> tuple[list[dict], dict[str, WeekSeances]]:
+    """
+    Parcourt les semaines à partir de la semaine courante (tant que bandes_annonces/<semaine>
+    existe) et prépare un job par bande-annonce ayant un poster : chemins, titre et séances.
+    Renvoie aussi les fichiers de séances chargés ({semaine: WeekSeances}), réutilisés
+    pour l'écriture des résultats.
+    """
     import glob
 
-    processed = False
+    jobs: list[dict] = []
+    weeks: dict[str, WeekSeances] = {}
     date_obj = datetime.today()
+    # Dimensions des vidéos sondées ici (une fois par fichier, index partagé) plutôt que dans le pool
+    probe = MediaProbe()
 
     while True:
-        annee = date_obj.strftime("%Y")
-        num_semaine = date_obj.strftime("%V")
-        semaine_dir = f"{annee}-S{num_semaine}"
-
-        videos_dir = os.path.join(PATH_VIDEOS, semaine_dir)
+        semaine_dir, videos_dir = get_videos_dir_from_date(date_obj)
         if not os.path.isdir(videos_dir):
             break
 
         video_files = glob.glob(os.path.join(videos_dir, "*.mp4"))
-
-        # ... au début du traitement de la semaine, juste avant la boucle sur les BAs :
-        updates_for_json: list[dict] = []
+        seances = weeks[semaine_dir] = WeekSeances(semaine_dir)
 
         for video_path in video_files:
             video_base_name = os.path.splitext(os.path.basename(video_path))[0]
@@ -392,7 +539,7 @@ def process_all_videos():
                 continue
 
             # Récupère le titre et les dates depuis seances/<semaine_dir>.json en se basant sur le fichier poster
-            result = _get_title_from_seance_by_poster(semaine_dir, os.path.basename(poster_path))
+            result = seances.title_for_poster(os.path.basename(poster_path))
             if result is not None:
                 seance_title, dates = result
                 titre_final = seance_title if seance_title else video_base_name
@@ -406,33 +553,82 @@ def process_all_videos():
             else:
                 print(f"[OK] Poster associé: {video_base_name} -> {os.path.basename(poster_path)} ; titre séance introuvable, on garde \"{video_base_name}\"")
 
-            # La fonction retourne maintenant le chemin du carton généré
-            carton_png_path = make_carton_for_video(video_path, poster_path, titre_final, dates or [], semaine_dir)
-            processed = True
-
-            # ... dans la boucle où vous traitez chaque bande-annonce et générez le carton:
-            # Supposons que vous disposiez déjà de:
-            # - semaine_dir: str (ex. "2025-S35")
-            # - seance_title: str (le titre exact de la séance)
-            # - b-input_path: str ou Path (chemin vers la bande-annonce en entrée)
-            # - carton_png_path: str ou Path (chemin du .png généré pour ce film)
-
-            # Après avoir déterminé ces chemins et généré le carton, ajoutez:
-            # carton_png_path = os.path.join(PATH_CARTONS, clean_title(titre_final) + '.png')  # deduit le chemin du carton
-            updates_for_json.append({
-                "titre": seance_title or titre_final,
-                "file_bandeannonce": str(Path(video_path).resolve()),
-                "file_carton": str(carton_png_path),
-            })
+            info = probe.probe(video_path)
+            if info is None or not info.width or not info.height:
+                print(f"[!] Dimensions illisibles pour : {video_path}, vidéo ignorée.")
+                continue
 
-        # ... après avoir terminé la boucle de traitement de toutes les BAs de la semaine :
-        _update_seances_json(semaine_dir, updates_for_json)
+            jobs.append({
+                "semaine_dir": semaine_dir,
+                "video_path": video_path,
+                "size": (info.width, info.height),
+                "poster_path": poster_path,
+                "titre": titre_final,
+                "dates": dates or [],
+                "titre_seance": seance_title or titre_final,
+            })
 
         date_obj += timedelta(weeks=1)
 
-    if not processed:
+    probe.save()
+    return jobs, weeks
+
+
+def _render_job(job: dict) -> str:
+    """Exécuté dans un processus du pool : chaque processus garde son propre CartonRenderer."""
+    return str(make_carton_for_video(job["video_path"], job["poster_path"], job["titre"],
+                                     job["dates"], job["semaine_dir"], job["size"]))
+
+
+def process_all_videos(workers: int | None = None):
+    """
+    Génère les cartons de toutes les semaines à venir : planification, rendu en
+    parallèle sur `workers` processus (tous les cœurs par défaut, 1 = séquentiel),
+    puis une seule mise à jour de seances/<semaine>.json par semaine.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    jobs, weeks = plan_carton_jobs()
+    if not jobs:
         print("Aucune vidéo trouvée.")
+        return
+
+    workers = workers or os.cpu_count() or 1
+    updates_by_week: dict[str, list[dict]] = {}
+
+    def record(job: dict, carton_png_path: str) -> None:
+        updates_by_week.setdefault(job["semaine_dir"], []).append({
+            "titre": job["titre_seance"],
+            "file_bandeannonce": str(Path(job["video_path"]).resolve()),
+            "file_carton": carton_png_path,
+        })
+
+    if workers <= 1 or len(jobs) == 1:
+        for job in jobs:
+            try:
+                record(job, _render_job(job))
+            except Exception as e:
+                print(f"[!] Échec du carton pour {job['video_path']}: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            futures = {executor.submit(_render_job, job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    record(job, future.result())
+                except Exception as e:
+                    print(f"[!] Échec du carton pour {job['video_path']}: {e}")
+
+    # Une écriture par semaine, dans l'ordre des semaines, depuis le fichier déjà chargé
+    for semaine_dir in sorted(updates_by_week):
+        weeks[semaine_dir].write_updates(updates_by_week[semaine_dir])
 
 
 if __name__ == '__main__':
-    process_all_videos()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Génère les cartons des bandes-annonces des semaines à venir")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processus de rendu en parallèle (défaut: nombre de cœurs, 1 = séquentiel)")
+    args = parser.parse_args()
+    process_all_videos(args.workers)
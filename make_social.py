@@ -111,6 +111,12 @@ def main():
                 titre = film.get("titre", "")
                 seances = film.get("seances", [])
                 description = film.get("description", "")
+                # Champs structurés de la fiche (get_description.py), s'ils sont présents
+                details = ", ".join(filter(None, [
+                    film.get("genre"),
+                    f"réalisé par {film['realisateur']}" if film.get("realisateur") else None,
+                    f"avec {', '.join(film['acteurs'][:3])}" if film.get("acteurs") else None,
+                ]))
                 url_youtube = film.get("url_youtube", "")
                 poster_filename = _find_poster_filename(titre, week_dir_name)
 
@@ -133,6 +139,7 @@ def main():
                 Rédige un post sympa et attrayant pour Instagram et Facebook pour annoncer le film "{titre}".
                 Le film sera projeté aux dates et heures suivantes : {', '.join(seances)}.
                 Voici une brève description du film : {description}.
+                {f"Informations complémentaires : {details}." if details else ""}
                 N'oublie pas d'inclure le lien de la bande-annonce YouTube au format texte : {url_youtube}
                 Ajoute quelques hashtags pertinents pour le cinéma, la sortie de film et les réseaux sociaux.
                 Le post doit être engageant et inciter les gens à venir voir le film.
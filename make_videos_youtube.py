@@ -20,8 +20,11 @@ from datetime import date, timedelta
 from pathlib import Path
 from typing import Tuple, Dict, Any, List, Optional
 
+from common import MediaInfo, MediaProbe
+
 
 STILL_DURATION_SECONDS = 5  # durée du carton (image fixe + silence)
+DEFAULT_FPS = 25  # fps du carton si celui de la bande-annonce est inconnu
 SEANCES_DIRNAME = "seances"
 OUTPUT_BASE_DIRNAME = "videos_youtube"
 
@@ -64,19 +67,31 @@ def _build_ffmpeg_command(
     carton_path: Path,
     out_path: Path,
     still_duration: int = STILL_DURATION_SECONDS,
+    info: Optional[MediaInfo] = None,
 ) -> List[str]:
     # Construire la commande telle que demandée (sans quoting manuel).
-    # Note: on suit strictement l'exemple fourni.
-    return [
+    # Les caractéristiques sondées de la bande-annonce (info) fixent le fps du carton
+    # et, si elle n'a pas de piste audio, on lui adjoint un silence pour le concat.
+    fps = (info.fps if info and info.fps else None) or DEFAULT_FPS
+    has_audio = info.has_audio if info else True
+    cmd = [
         "ffmpeg", "-y",
         "-i", str(ba_path),  # Vidéo bande-annonce
         "-vsync", "2",  # <- clé pour éviter les duplications massives
         "-loop", "1", "-t", str(still_duration), "-i", str(carton_path),  # Carton fixe 5 sec
         "-f", "lavfi", "-t", str(still_duration), "-i", "anullsrc",  # Silence 5 sec pour carton
+    ]
+    trailer_audio = "[0:a]"
+    if not has_audio:
+        # Bande-annonce muette : silence de même durée à la place de sa piste audio
+        duration = info.duration if info and info.duration else still_duration
+        cmd += ["-f", "lavfi", "-t", f"{duration:g}", "-i", "anullsrc"]
+        trailer_audio = "[3:a]"
+    return cmd + [
         # Harmonisation du framerate et format du carton avant concat
         "-filter_complex",
-        "[1:v]fps=25,format=yuv420p[v1];"  # Carton : 25 fps, format standard
-        "[0:v][0:a][v1][2:a]concat=n=2:v=1:a=1[v][a]",
+        f"[1:v]fps={fps:g},format=yuv420p[v1];"  # Carton : fps de la bande-annonce, format standard
+        f"[0:v]{trailer_audio}[v1][2:a]concat=n=2:v=1:a=1[v][a]",
         "-c:v", "libx264", "-preset", "fast",  # Encodage vidéo rapide
         "-c:a", "aac", "-b:a", "128k",  # Audio AAC
         "-map", "[v]", "-map", "[a]",
@@ -137,6 +152,8 @@ def process_week(base_dir: Path, week_str: str) -> None:
         print(f"[WARN] Aucun élément dans {seances_path}", flush=True)
         return
 
+    probe = MediaProbe()
+
     for idx, item in enumerate(items, start=1):
         ba_path = _path_or_none(item.get("file_bandeannonce"))
         carton_path = _path_or_none(item.get("file_carton"))
@@ -160,7 +177,7 @@ def process_week(base_dir: Path, week_str: str) -> None:
             print(f"[WARN] Élément {idx} ({film_title}): champs manquants ou fichiers introuvables: {', '.join(missing)}. Saut...", flush=True)
             continue
 
-        cmd = _build_ffmpeg_command(ba_path, carton_path, out_path)
+        cmd = _build_ffmpeg_command(ba_path, carton_path, out_path, info=probe.probe(ba_path))
         print(f"[INFO] Élément {idx}: ffmpeg -> {out_path.name}", flush=True)
 
         try:
@@ -188,6 +205,7 @@ def process_week(base_dir: Path, week_str: str) -> None:
             print(f"[ERROR] Erreur inattendue pour {out_path.name}: {e}", flush=True)
             continue
 
+    probe.save()
 
 
 def main(argv: List[str]) -> int:
@@ -8,6 +8,8 @@ from datetime import datetime, timezone
 import dateutil.parser
 from dateutil import tz
 
+from common import poster_variant
+
 load_dotenv()
 
 META_LONG_LIVED_TOKEN = os.getenv("META_LONG_LIVED_TOKEN") # Peut encore être utile pour d'autres opérations utilisateur si nécessaire
@@ -563,7 +565,8 @@ def sync_posts_from_directory(posts_dir: str | Path) -> None:
         if week_dir_name and poster_filename:
             candidate = posters_base / week_dir_name / poster_filename
             if candidate.exists() and candidate.is_file():
-                image_path = candidate
+                # Variante réduite pour l'envoi (quelques centaines de Kio au lieu de plusieurs Mio)
+                image_path = poster_variant(candidate, "meta", posters_base)
                 res = _schedule_facebook_photo(message, image_path, ts_utc)
 
         # Fallback: post texte si échec ou pas d'image
@@ -0,0 +1,9 @@
+import os
+import sys
+from pathlib import Path
+
+# Les scripts sont à la racine du dépôt et s'importent comme modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# get_bandes_annonces refuse de s'importer sans clé API (aucun appel n'est fait dans les tests)
+os.environ.setdefault("YOUTUBE_API_KEY", "test")
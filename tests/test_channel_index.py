@@ -0,0 +1,54 @@
+import pytest
+
+from get_bandes_annonces import ChannelIndex, film_title_words
+
+# Titres de vidéos tels que publiés par les chaînes des distributeurs
+VIDEOS = {
+    "elio": ("ELIO - Bande-annonce officielle (VF) | Disney", "Disney FR"),
+    "elio-making-of": ("Elio : dans les coulisses du film", "Disney FR"),
+    "schtroumpfs": ("LES SCHTROUMPFS - LE FILM | Bande-annonce officielle VF", "Paramount Pictures France"),
+    "f1": ("F1® LE FILM - Bande-annonce officielle VF", "Warner Bros. France"),
+    "dracula": ("DRACULA - Bande-annonce officielle VF - Luc Besson", "SND"),
+    "dracula-untold": ("Dracula Untold - Trailer", "Universal Pictures"),
+    "tom": ("TOM LE CHAT À LA RECHERCHE DU DOUDOU PERDU - Bande-annonce", "KMBO Films"),
+    "ca-commence": ("Ça commence bientôt - bande annonce de la saison", "SND"),
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    channel_index = ChannelIndex([channel for _, channel in VIDEOS.values()], path=tmp_path / "index.json")
+    channel_index.videos = {
+        video_id: {"title": title, "channel": channel, "published_at": "2025-06-01T00:00:00Z"}
+        for video_id, (title, channel) in VIDEOS.items()
+    }
+    return channel_index
+
+
+@pytest.mark.parametrize("title, words, hints", [
+    ("ELIO (SHARAFIAN)", ["elio"], ["sharafian"]),
+    ("SCHTROUMPFS LE FILM (LES)", ["les", "schtroumpfs", "le", "film"], []),
+    ("ETE DERNIER (L')", ["l", "ete", "dernier"], []),
+    ("TOM LE CHAT A LA RECHERCHE DU DOUDOU PER", ["tom", "le", "chat", "a", "la", "recherche", "du", "doudou", "per"], []),
+    ("MISSION IMPOSSIBLE (MCQUAR", ["mission", "impossible"], []),
+])
+def test_film_title_words(title, words, hints):
+    assert film_title_words(title) == (words, hints)
+
+
+@pytest.mark.parametrize("title, expected", [
+    # Titres au format du programme des distributeurs
+    ("ELIO (SHARAFIAN)", ["elio"]),
+    ("SCHTROUMPFS LE FILM (LES)", ["schtroumpfs"]),
+    ("F1 (KOSINSKI)", ["f1"]),
+    ("DRACULA (BESSON)", ["dracula"]),
+    ("TOM LE CHAT A LA RECHERCHE DU DOUDOU PER", ["tom"]),
+    # Le nom de la chaîne n'est pas un mot en trop
+    ("Elio", ["elio"]),
+    # Titre court contenu dans un titre plus long : pas de correspondance hasardeuse
+    ("Ça", []),
+    # Titre fait de mots d'habillage : laissé à la recherche globale
+    ("Le", []),
+])
+def test_candidates_distributor_titles(index, title, expected):
+    assert [video_id for video_id, _ in index.candidates(title)] == expected
@@ -0,0 +1,24 @@
+import pytest
+
+from get_bandes_annonces import distributor_channels
+
+CHANNELS = [
+    "Disney FR", "Gaumont", "LeParcDistribution", "Pathe", "Pathé Films", "PyramideDistrib",
+    "UGC Distribution", "Universal Pictures France", "Wild Bunch Distribution",
+]
+
+
+@pytest.mark.parametrize("distributeur, expected", [
+    ("THE WALT DISNEY COMPANY", ["Disney FR"]),
+    ("PATHE FILMS", ["Pathe", "Pathé Films"]),
+    ("PYRAMIDE DISTRIBUTION", ["PyramideDistrib"]),
+    ("LE PARC DISTRIBUTION", ["LeParcDistribution"]),
+    ("UGC Distrib", ["UGC Distribution"]),
+    ("UNIVERSAL PICTURES INTERNATIONAL FRANCE", ["Universal Pictures France"]),
+    # Nom tronqué du programme : "Distribut" ne doit pas désigner LeParcDistribution
+    ("GAUMONT Deprt Distribut? Fr", ["Gaumont"]),
+    ("Distribut? Internat", []),
+    ("", []),
+])
+def test_distributor_channels(distributeur, expected):
+    assert distributor_channels(distributeur, CHANNELS) == expected
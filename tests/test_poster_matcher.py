@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from make_cartons import POSTER_MATCH_THRESHOLD, PosterMatcher, _normalize_title, _score_similarity
+
+# Noms de posters tels que get_posters les écrit (sanitize_filename du titre)
+POSTERS = [
+    "Spider-Man", "Spider-Man_-_Across_the_Spider-Verse", "L'Été_dernier", "Ça", "Elle", "It", "Up",
+    "Le_Seigneur_des_anneaux_(version_longue)", "Vice-Versa", "Vice-Versa_2", "Le_Parrain_VOST",
+    "Les_4_Fantastiques_-_Premiers_pas", "Dracula", "Y_a_pas_de_réseau", "Eddington",
+    "Renard_et_Lapine_sauvent_la_forêt", "Les_Bad_Guys_2", "Mickey_17",
+]
+PATHS = [f"/posters/2025-S33/{name}.jpg" for name in POSTERS]
+
+
+def brute_force_best(paths, video_base_name):
+    """Recherche d'origine : chaque poster est noté, dans l'ordre du glob."""
+    target_norm = _normalize_title(video_base_name)
+    best_path, best_score = None, 0.0
+    for path in paths:
+        score = _score_similarity(target_norm, _normalize_title(os.path.splitext(os.path.basename(path))[0]))
+        if score > best_score:
+            best_path, best_score = path, score
+    return best_path if best_path and best_score >= POSTER_MATCH_THRESHOLD else None
+
+
+@pytest.mark.parametrize("video, poster", [
+    ("Spiderman", "Spider-Man"),
+    ("Spider Man", "Spider-Man"),
+    ("Spiderman Across the Spider Verse", "Spider-Man_-_Across_the_Spider-Verse"),
+    ("L'ete dernier", "L'Été_dernier"),
+    ("L'Été dernier (VOST)", "L'Été_dernier"),
+    ("Ca", "Ça"),
+    ("ça", "Ça"),
+    ("ELLE (VOST)", "Elle"),
+    ("It", "It"),
+    ("Up", "Up"),
+    ("Le Seigneur des anneaux", "Le_Seigneur_des_anneaux_(version_longue)"),
+    ("Le Seigneur des Anneaux (version longue)", "Le_Seigneur_des_anneaux_(version_longue)"),
+    ("Vice Versa", "Vice-Versa"),
+    ("Vice Versa 2 VOST", "Vice-Versa_2"),
+    ("Le Parrain", "Le_Parrain_VOST"),
+    ("Dracula (2025)", "Dracula"),
+    ("Y a pas de reseau", "Y_a_pas_de_réseau"),
+    ("Mickey17", "Mickey_17"),
+    ("Inconnu au programme", None),
+    ("Zz", None),
+])
+def test_best_poster(video, poster):
+    expected = f"/posters/2025-S33/{poster}.jpg" if poster else None
+    assert brute_force_best(PATHS, video) == expected
+    assert PosterMatcher(PATHS).best(video) == expected
+
+
+def _variants(name):
+    base = os.path.splitext(name)[0].replace("_", " ")
+    yield base
+    yield base.upper()
+    yield _normalize_title(base)                 # sans accents ni ponctuation
+    yield base.replace("-", "")                  # "Spiderman"
+    yield base.replace("-", " ")
+    yield f"{base} (version longue)"
+    yield f"{base} VOST"
+    yield f"{base} VF"
+    yield base.split()[0]                        # premier mot seul
+    yield " ".join(base.split()[:2])
+
+
+def test_index_matches_brute_force():
+    # L'index ne fait que présélectionner : il ne doit jamais écarter le poster retenu par le parcours complet
+    matcher = PosterMatcher(PATHS)
+    for name in POSTERS:
+        for video in _variants(name):
+            assert matcher.best(video) == brute_force_best(PATHS, video), video
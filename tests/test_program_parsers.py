@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+
+import get_prog_from_site
+
+PARADISO_HTML = Path(__file__).resolve().parent.parent / "examples" / "Cinema Paradiso Nort sur Erdre.html"
+
+# Semaines attendues sur la page d'exemple : date de début -> [(titre, fiche, affiche, horaires)],
+# dans l'ordre de la page (les doublons d'horaires de la page sont conservés)
+EXPECTED = [
+    ("13 août 2025", [
+        ("Les 4 Fantastiques : Premiers pas", "/ajax/film/4458", "/images/films/f769d6c32f0e8fed2e288bdf99062e47.jpg",
+         ["mercredi 13 août 2025 20h30 Prochaine séance", "samedi 16 août 2025 20h30"]),
+        ("Enzo", "/ajax/film/4460", "/images/films/324bf1f23666e549b208319546c649ae.jpg",
+         ["jeudi 14 août 2025 20h30"]),
+        ("Marius Et Les Gardiens De La Cité Phocéenne", "/ajax/film/4461",
+         "/images/films/b910ffb0f168384b77a8937822191439.jpg",
+         ["vendredi 15 août 2025 20h30", "dimanche 17 août 2025 20h30"]),
+        ("Renard et Lapine sauvent la forêt", "/ajax/film/4463", "/images/films/f9bd534721b77cfc541a2d6bfc9417f2.jpg",
+         ["dimanche 17 août 2025 10h30"]),
+    ]),
+    ("20 août 2025", [
+        ("Dracula", "/ajax/film/4464", "/images/films/d6689e7ddcc5b1247c7fe6f73bf39249.jpg",
+         ["mercredi 20 août 2025 20h30", "vendredi 22 août 2025 20h30"]),
+        ("Aux jours qui viennent", "/ajax/film/4466", "/images/films/24a34f6cacca6a51d5d4211ff9f58023.jpg",
+         ["jeudi 21 août 2025 20h30", "dimanche 24 août 2025 20h30"]),
+        ("Les Bad Guys 2", "/ajax/film/4468", "/images/films/d3d32a7b6afa647739e03e6c3646ccd5.jpg",
+         ["samedi 23 août 2025 20h30", "dimanche 24 août 2025 10h30"]),
+    ]),
+    ("27 août 2025", [
+        ("Freaky Friday 2 : Encore dans la peau de ma mère", "/ajax/film/4470",
+         "/images/films/fd294077110a6d905cf6e3961f8c209f.jpg",
+         ["mercredi 27 août 2025 20h30", "vendredi 29 août 2025 20h30"]),
+        ("Eddington", "/ajax/film/4472", "/images/films/ba6ef5ffa6a8a65915936db1ce5b3838.jpg",
+         ["jeudi 28 août 2025 20h30 VO"]),
+        ("Y a pas de réseau", "/ajax/film/4473", "/images/films/911049e0f16d9666f9b94c2e16ab2652.jpg",
+         ["samedi 30 août 2025 20h30", "dimanche 31 août 2025 20h30"]),
+        ("Buffalo Kids", "/ajax/film/4475", "/images/films/d48ab0842f58918f066d8881d5c64e97.jpg",
+         ["dimanche 31 août 2025 10h30", "dimanche 31 août 2025 10h30"]),
+    ]),
+]
+
+
+def _backends():
+    for name in sorted(get_prog_from_site.PARSER_BACKENDS):
+        marks = []
+        if name == get_prog_from_site.LxmlProgramParser.name and get_prog_from_site.lxml_html is None:
+            marks.append(pytest.mark.skip(reason="lxml non installé"))
+        yield pytest.param(name, marks=marks)
+
+
+@pytest.mark.parametrize("backend", list(_backends()))
+def test_parse_weeks_example_page(backend):
+    html = PARADISO_HTML.read_text(encoding="utf-8")
+    semaines = get_prog_from_site.get_program_parser(backend).parse_weeks(html)
+
+    got = [
+        (date_debut, [(titre, film.url_fiche, film.url_poster, film.horaires) for titre, film in films.items()])
+        for date_debut, films in semaines
+    ]
+    assert got == EXPECTED
+    for _, films in semaines:
+        assert all(film.titre == titre for titre, film in films.items())
@@ -0,0 +1,20 @@
+from get_bandes_annonces import TrailerLibrary
+
+
+def test_file_for_ignores_split_format_leftovers(tmp_path):
+    library = TrailerLibrary(root=tmp_path)
+    # Fusion ratée : flux vidéo seul et flux audio partiel
+    (tmp_path / "abc.f137.mp4").write_bytes(b"video")
+    (tmp_path / "abc.f140.m4a.part").write_bytes(b"audio")
+    assert library.file_for("abc") is None
+
+    (tmp_path / "abc.mp4").write_bytes(b"merged")
+    assert library.file_for("abc") == tmp_path / "abc.mp4"
+
+
+def test_file_for_drops_fragment_recorded_in_index(tmp_path):
+    library = TrailerLibrary(root=tmp_path)
+    (tmp_path / "abc.f137.mp4").write_bytes(b"video")
+    library.videos["abc"] = "abc.f137.mp4"
+    assert library.file_for("abc") is None
+    assert "abc" not in library.videos